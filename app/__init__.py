@@ -5,7 +5,7 @@ from flask import Flask, current_app
 from flask.cli import with_appcontext
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import inspect, text
+from sqlalchemy import event, inspect, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
 import os
@@ -87,10 +87,13 @@ def create_app(config_class: type[Config] = Config) -> Flask:
     from . import models  # noqa: F401  # Ensure models registered for migrations
 
     with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _enable_sqlite_foreign_keys)
         db.create_all()
         _ensure_session_class_group_column()
         _ensure_session_subgroup_column()
         _ensure_session_subgroup_uniqueness_constraint()
+        _ensure_session_duration_column()
         _ensure_course_class_group_count_column()
         _ensure_course_class_subgroup_name_columns()
         _ensure_course_class_teacher_columns()
@@ -102,6 +105,8 @@ def create_app(config_class: type[Config] = Config) -> Flask:
         _ensure_course_color_column()
         _ensure_student_profile_columns()
         _ensure_session_attendance_backfill()
+        _ensure_session_delete_cascades()
+        _ensure_lookup_indexes()
         updated_sessions = _realign_tp_session_teachers()
         if updated_sessions:
             app.logger.info(
@@ -132,6 +137,14 @@ def create_app(config_class: type[Config] = Config) -> Flask:
     return app
 
 
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    """Let SQLite honour ``ON DELETE CASCADE`` like the production database."""
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 def _ensure_session_class_group_column() -> None:
     """Add the class_group_id column to existing session tables if missing."""
     engine = db.engine
@@ -247,6 +260,39 @@ def _quote_mysql_identifier(identifier: str) -> str:
     return f"`{escaped}`"
 
 
+def _ensure_session_duration_column() -> None:
+    """Add and backfill the stored ``session.duration_hours`` column."""
+
+    from .models import Session, whole_hours_between
+
+    engine = db.engine
+    inspector = inspect(engine)
+    if "session" not in inspector.get_table_names():
+        return
+
+    existing_columns = {column["name"] for column in inspector.get_columns("session")}
+    if "duration_hours" in existing_columns:
+        return
+
+    table = Session.__table__
+    try:
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "ALTER TABLE session ADD COLUMN duration_hours INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+            connection.execute(
+                table.update().values(
+                    duration_hours=whole_hours_between(table.c.start_time, table.c.end_time)
+                )
+            )
+    except SQLAlchemyError as exc:  # pragma: no cover - defensive guard
+        current_app.logger.warning(
+            "Unable to add duration_hours column to session: %s", exc
+        )
+
+
 def _ensure_session_subgroup_uniqueness_constraint() -> None:
     engine = db.engine
     inspector = inspect(engine)
@@ -824,3 +870,81 @@ def _ensure_session_attendance_backfill() -> None:
             "Unable to backfill session_attendance table: %s", exc
         )
 
+
+def _ensure_session_delete_cascades() -> None:
+    """Recreate legacy session foreign keys with ``ON DELETE CASCADE``.
+
+    ``Course.sessions`` relies on the database to remove sessions (and their
+    attendance rows) when a course is deleted, instead of loading every child
+    row before issuing one DELETE per session.
+    """
+
+    engine = db.engine
+    if engine.dialect.name != "mysql":
+        return
+    inspector = inspect(engine)
+    table_names = set(inspector.get_table_names())
+
+    targets = (
+        ("session", "course_id", "course"),
+        ("session_attendance", "session_id", "session"),
+    )
+    statements: list[str] = []
+    for table, column, referred_table in targets:
+        if table not in table_names:
+            continue
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key.get("constrained_columns") != [column]:
+                continue
+            if foreign_key.get("referred_table") != referred_table:
+                continue
+            ondelete = (foreign_key.get("options") or {}).get("ondelete")
+            if ondelete and ondelete.upper() == "CASCADE":
+                continue
+            name = foreign_key.get("name")
+            if not name:
+                continue
+            statements.append(
+                f"ALTER TABLE {_quote_mysql_identifier(table)} "
+                f"DROP FOREIGN KEY {_quote_mysql_identifier(name)}, "
+                f"ADD CONSTRAINT {_quote_mysql_identifier(name)} "
+                f"FOREIGN KEY ({column}) REFERENCES {referred_table} (id) "
+                "ON DELETE CASCADE"
+            )
+
+    if not statements:
+        return
+
+    try:
+        with engine.begin() as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+    except SQLAlchemyError as exc:  # pragma: no cover - defensive guard
+        current_app.logger.warning(
+            "Unable to add ON DELETE CASCADE to session foreign keys: %s", exc
+        )
+
+
+def _ensure_lookup_indexes() -> None:
+    """Create the range lookup indexes missing from databases built earlier."""
+
+    from .models import ClosingPeriod, Session, TeacherAvailability
+
+    engine = db.engine
+    inspector = inspect(engine)
+    table_names = set(inspector.get_table_names())
+
+    for model in (ClosingPeriod, Session, TeacherAvailability):
+        table = model.__table__
+        if table.name not in table_names:
+            continue
+        existing = {index.get("name") for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(engine)
+            except SQLAlchemyError as exc:  # pragma: no cover - defensive guard
+                current_app.logger.warning(
+                    "Unable to create index %s: %s", index.name, exc
+                )
@@ -8,12 +8,6 @@ from .models import Session
 from .scheduler import EXTENDED_BREAKS, MAX_SLOT_GAP
 
 
-def _normalise_label(label: str | None) -> str:
-    if not label:
-        return ""
-    return label.strip().upper()
-
-
 def _sessions_can_chain(previous: Session, current: Session) -> bool:
     if previous.course_id != current.course_id:
         return False
@@ -23,7 +17,7 @@ def _sessions_can_chain(previous: Session, current: Session) -> bool:
         return False
     if previous.teacher_id != current.teacher_id:
         return False
-    if _normalise_label(previous.subgroup_label) != _normalise_label(current.subgroup_label):
+    if previous.normalised_subgroup_label != current.normalised_subgroup_label:
         return False
     if previous.start_time.date() != current.start_time.date():
         return False
@@ -45,40 +39,53 @@ def _build_event_from_group(group: List[Session]) -> dict[str, object]:
     if first.course.color:
         event["backgroundColor"] = first.course.color
         event["borderColor"] = first.course.color
+    if len(group) == 1:
+        # ``as_event`` already describes a lone session exactly as the merge
+        # below would, so skip rebuilding its title, segments and lists.
+        return event
     ordered_rooms: list[str] = []
-    segments: list[dict[str, str]] = []
+    segments: list[dict[str, object]] = []
     extended = event.setdefault("extendedProps", {})
     required_softwares = set(extended.get("course_softwares") or [])
     available_softwares = set(extended.get("room_softwares") or [])
     missing_softwares = set(extended.get("missing_softwares") or [])
     room_computer_counts: list[int | None] = []
-    class_names: set[str] = set()
+    # Chained sessions share their course and attendees (see
+    # _sessions_can_chain), so only rooms can differ from the first session.
+    course_softwares = first.course.softwares
+    seen_room_ids: set[int] = {first.room_id}
     for session in group:
-        room_name = session.room.name
+        room = session.room
+        room_name = room.name
         if room_name not in ordered_rooms:
             ordered_rooms.append(room_name)
         segments.append(
             {
                 "id": str(session.id),
-                "start": session.start_time.isoformat(),
-                "end": session.end_time.isoformat(),
+                "start": session.start_time,
+                "end": session.end_time,
                 "room": room_name,
             }
         )
-        required_softwares.update(software.name for software in session.course.softwares)
-        available_softwares.update(software.name for software in session.room.softwares)
-        room_software_ids = {software.id for software in session.room.softwares}
+        room_computer_counts.append(room.computers)
+        if session.room_id in seen_room_ids:
+            continue
+        seen_room_ids.add(session.room_id)
+        available_softwares.update(room._software_names)
+        room_software_ids = room._software_ids
         missing_softwares.update(
             software.name
-            for software in session.course.softwares
+            for software in course_softwares
             if software.id not in room_software_ids
         )
-        room_computer_counts.append(session.room.computers)
-        class_names.update(session.attendee_names())
-    event["start"] = group[0].start_time.isoformat()
-    event["end"] = group[-1].end_time.isoformat()
+    event["start"] = group[0].start_time
+    event["end"] = group[-1].end_time
     room_label = ", ".join(ordered_rooms) or first.room.name
-    event["title"] = first.title_with_room(room_label)
+    event["title"] = first.title_with_room(
+        room_label,
+        attendee_names=extended.get("class_groups"),
+        subgroup_name=extended.get("subgroup_name"),
+    )
     extended["room"] = room_label
     extended["rooms"] = ordered_rooms
     extended["segments"] = segments
@@ -95,10 +102,6 @@ def _build_event_from_group(group: List[Session]) -> dict[str, object]:
             extended["room_computers"] = unique_counts.pop()
         else:
             extended["room_computers"] = None
-    if class_names:
-        class_list = sorted(class_names, key=str.lower)
-        extended["class_group"] = ", ".join(class_list)
-        extended["class_groups"] = class_list
     if len(group) > 1:
         event["id"] = "group-" + "-".join(extended["segment_ids"])
     return event
@@ -109,7 +112,7 @@ def sessions_to_grouped_events(sessions: Iterable[Session]) -> list[dict[str, ob
         sessions,
         key=lambda session: (
             session.class_group_id,
-            _normalise_label(session.subgroup_label),
+            session.normalised_subgroup_label or "",
             session.course_id,
             session.teacher_id,
             session.start_time,
@@ -1,29 +1,52 @@
 from __future__ import annotations
 
-import json
+from bisect import bisect_left, bisect_right
 from datetime import date, datetime, time, timedelta
+from functools import cached_property
 from math import ceil
-from itertools import combinations
-from typing import Iterable, List, Optional, Set
+from itertools import chain, combinations
+from operator import attrgetter
+from typing import Callable, Iterable, List, Optional
 
+from flask import current_app, g, has_app_context
 from sqlalchemy import (
     CheckConstraint,
     Column,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
     Time,
     UniqueConstraint,
+    case,
+    event,
+    func,
+    inspect,
+    select,
 )
 from sqlalchemy.ext.associationproxy import association_proxy
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import (
+    Load,
+    Mapped,
+    column_property,
+    joinedload,
+    mapped_column,
+    relationship,
+    selectinload,
+    validates,
+)
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
 
 from . import db
-from .utils import parse_unavailability_ranges
+from .utils import dumps_json, loads_json, parse_unavailability_ranges
 
 
 course_software = Table(
@@ -73,11 +96,65 @@ course_name_preferred_room = Table(
 session_attendance = Table(
     "session_attendance",
     db.Model.metadata,
-    Column("session_id", ForeignKey("session.id"), primary_key=True),
+    Column("session_id", ForeignKey("session.id", ondelete="CASCADE"), primary_key=True),
     Column("class_group_id", ForeignKey("class_group.id"), primary_key=True),
 )
 
 
+class whole_hours_between(FunctionElement):
+    """SQL expression counting the whole hours elapsed between two datetimes."""
+
+    type = Integer()
+    name = "whole_hours_between"
+    inherit_cache = True
+
+
+@compiles(whole_hours_between)
+def _compile_whole_hours_between(element, compiler, **kw) -> str:
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"TIMESTAMPDIFF(HOUR, {start}, {end})"
+
+
+@compiles(whole_hours_between, "sqlite")
+def _compile_whole_hours_between_sqlite(element, compiler, **kw) -> str:
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return (
+        f"((CAST(strftime('%s', {end}) AS INTEGER)"
+        f" - CAST(strftime('%s', {start}) AS INTEGER)) / 3600)"
+    )
+
+
+@compiles(whole_hours_between, "postgresql")
+def _compile_whole_hours_between_postgresql(element, compiler, **kw) -> str:
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"(CAST(EXTRACT(EPOCH FROM ({end} - {start})) AS INTEGER) / 3600)"
+
+
+class JSONText(TypeDecorator):
+    """JSON document stored in a ``TEXT`` column.
+
+    Existing databases keep their column type; values are decoded on load so
+    callers work with Python lists and dicts. Unreadable legacy payloads load
+    as ``None``.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return dumps_json(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return loads_json(value)
+        except ValueError:
+            return None
+
+
 def default_start_time() -> time:
     return time(8, 0)
 
@@ -91,6 +168,9 @@ class TimeStampedModel:
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+_CLOSED_RANGES_KEY = "_chronos_closed_ranges"
+
+
 class ClosingPeriod(db.Model, TimeStampedModel):
     id: Mapped[int] = mapped_column(primary_key=True)
     start_date: Mapped[date] = mapped_column(Date, nullable=False)
@@ -99,27 +179,65 @@ class ClosingPeriod(db.Model, TimeStampedModel):
 
     __table_args__ = (
         CheckConstraint("end_date >= start_date", name="chk_closing_period_range"),
+        Index("ix_closing_period_range", "start_date", "end_date"),
     )
 
     @classmethod
     def ordered_periods(cls) -> List["ClosingPeriod"]:
         return cls.query.order_by(cls.start_date, cls.end_date, cls.id).all()
 
+    @classmethod
+    def _closed_range_index(
+        cls,
+    ) -> tuple[list[tuple[date, date]], list[date], list[date]]:
+        if has_app_context():
+            cached = g.get(_CLOSED_RANGES_KEY)
+            if cached is not None:
+                return cached
+        ranges = [
+            (start, end)
+            for start, end in db.session.execute(
+                select(cls.start_date, cls.end_date).order_by(
+                    cls.start_date, cls.end_date, cls.id
+                )
+            )
+        ]
+        starts = [start for start, _ in ranges]
+        running_ends: list[date] = []
+        for _, end in ranges:
+            running_ends.append(max(end, running_ends[-1]) if running_ends else end)
+        index = (ranges, starts, running_ends)
+        if has_app_context():
+            setattr(g, _CLOSED_RANGES_KEY, index)
+        return index
+
+    @classmethod
+    def closed_ranges(cls) -> list[tuple[date, date]]:
+        """Return every closing period as ``(start, end)`` sorted by start.
+
+        The table is read once per application context and kept on
+        ``flask.g``; any write to the table drops the cached copy.
+        """
+
+        return list(cls._closed_range_index()[0])
+
+    @classmethod
+    def is_day_closed_cached(cls, day: date) -> bool:
+        _, starts, running_ends = cls._closed_range_index()
+        position = bisect_right(starts, day)
+        return position > 0 and running_ends[position - 1] >= day
+
     @classmethod
     def is_day_closed(cls, day: date) -> bool:
-        return (
-            cls.query.filter(cls.start_date <= day, cls.end_date >= day).first()
-            is not None
-        )
+        return cls.is_day_closed_cached(day)
 
     @classmethod
     def overlaps(cls, start: date, end: date) -> bool:
         if start > end:
             start, end = end, start
-        return (
-            cls.query.filter(cls.start_date <= end, cls.end_date >= start).first()
-            is not None
-        )
+        _, starts, running_ends = cls._closed_range_index()
+        position = bisect_right(starts, end)
+        return position > 0 and running_ends[position - 1] >= start
 
     def as_range(self) -> tuple[date, date]:
         return (self.start_date, self.end_date)
@@ -148,54 +266,124 @@ class Teacher(db.Model, TimeStampedModel):
         order_by="TeacherAvailability.weekday",
     )
 
+    @cached_property
+    def unavailable_ranges(self) -> tuple[tuple[date, date], ...]:
+        """Merged ``(start, end)`` unavailability ranges, parsed once per value."""
+
+        return tuple(parse_unavailability_ranges(self.unavailable_dates))
+
+    @cached_property
+    def slots_by_weekday(self) -> dict[int, list["TeacherAvailability"]]:
+        """Availability slots grouped by weekday, each list sorted by start."""
+
+        slots: dict[int, list[TeacherAvailability]] = {}
+        for availability in self.availabilities:
+            slots.setdefault(availability.weekday, []).append(availability)
+        for day_slots in slots.values():
+            day_slots.sort(key=attrgetter("start_time"))
+        return slots
+
+    @cached_property
+    def _merged_slots_by_weekday(self) -> dict[int, tuple[list[int], list[int]]]:
+        merged: dict[int, tuple[list[int], list[int]]] = {}
+        for weekday, day_slots in self.slots_by_weekday.items():
+            starts: list[int] = []
+            ends: list[int] = []
+            for slot in day_slots:
+                slot_start, slot_end = slot.second_span
+                if ends and slot_start <= ends[-1]:
+                    ends[-1] = max(ends[-1], slot_end)
+                    continue
+                starts.append(slot_start)
+                ends.append(slot_end)
+            merged[weekday] = (starts, ends)
+        return merged
+
     def is_available_on(self, day: datetime | date) -> bool:
         target_date = day.date() if isinstance(day, datetime) else day
-        if target_date.weekday() >= 5:
+        weekday = target_date.weekday()
+        if weekday >= 5:
             return False
-        for start, end in parse_unavailability_ranges(self.unavailable_dates):
-            if start <= target_date <= end:
+        for start, end in self.unavailable_ranges:
+            if start > target_date:
+                break
+            if target_date <= end:
                 return False
-        return any(a.weekday == target_date.weekday() for a in self.availabilities)
+        return weekday in self.slots_by_weekday
 
     def is_available_during(self, start: datetime, end: datetime) -> bool:
+        # Availability slots are intra-day, so empty, reversed or
+        # cross-midnight windows can never be covered.
+        if start >= end or start.date() != end.date():
+            return False
         if not self.is_available_on(start):
             return False
-        day_slots = sorted(
-            (a for a in self.availabilities if a.weekday == start.weekday()),
-            key=lambda a: a.start_time,
-        )
-        if not day_slots:
+        merged = self._merged_slots_by_weekday.get(start.weekday())
+        if merged is None:
             return False
-        coverage = start.time()
-        target_end = end.time()
-        for slot in day_slots:
-            if slot.end_time <= coverage:
-                continue
-            if slot.start_time > coverage:
-                return False
-            if slot.end_time > coverage:
-                coverage = slot.end_time
-            if coverage >= target_end:
-                return True
-        return False
+        starts, ends = merged
+        # Touching or overlapping slots are merged, so the window must fit
+        # inside the single block starting at or before ``start``.
+        start_seconds = _seconds_since_midnight(start)
+        index = bisect_right(starts, start_seconds) - 1
+        return (
+            index >= 0
+            and ends[index] > start_seconds
+            and ends[index] >= _seconds_since_midnight(end)
+        )
+
+    def scheduled_hours_by_course(self) -> dict[int, int]:
+        """Return the hours this teacher is scheduled for, keyed by course id."""
+
+        if self.id is None or "sessions" in inspect(self).dict:
+            totals: dict[int, int] = {}
+            for session in self.sessions:
+                totals[session.course_id] = (
+                    totals.get(session.course_id, 0) + session.duration_hours
+                )
+            return totals
+        rows = db.session.execute(
+            select(Session.course_id, func.sum(Session.duration_hours))
+            .where(Session.teacher_id == self.id)
+            .group_by(Session.course_id)
+        )
+        return {course_id: int(total or 0) for course_id, total in rows}
 
     def overlapping_available_hours(self, other: "Teacher") -> float:
         """Return the amount of overlapping availability with ``other`` in hours."""
 
         if other is self:
             return 0.0
-        total = 0.0
-        for weekday in range(7):
-            my_slots = [a for a in self.availabilities if a.weekday == weekday]
-            other_slots = [a for a in other.availabilities if a.weekday == weekday]
-            if not my_slots or not other_slots:
-                continue
-            for mine in my_slots:
-                for theirs in other_slots:
-                    overlap = _availability_overlap_hours(mine, theirs)
-                    if overlap > 0:
-                        total += overlap
-        return total
+        my_slots = _slot_seconds_by_weekday(self.availabilities)
+        other_slots = _slot_seconds_by_weekday(other.availabilities)
+        total_seconds = 0
+        for weekday, slots in my_slots.items():
+            theirs = other_slots.get(weekday)
+            if theirs:
+                total_seconds += _shared_seconds(slots, theirs)
+        return total_seconds / 3600
+
+    @cached_property
+    def _session_timeline(
+        self,
+    ) -> tuple[list[datetime], list[datetime], tuple[Session, ...]]:
+        """Sessions sorted by start, with the running max end."""
+
+        return _build_session_timeline(self.sessions)
+
+    def has_session_during(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        ignore_session_id: Optional[int] = None,
+    ) -> bool:
+        """Whether any of the teacher's sessions overlaps ``[start, end)``."""
+
+        return any(
+            not ignore_session_id or session.id != ignore_session_id
+            for session in _timeline_overlapping(self._session_timeline, start, end)
+        )
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"Teacher<{self.id} {self.name}>"
@@ -209,7 +397,9 @@ class Room(db.Model, TimeStampedModel):
     notes: Mapped[Optional[str]] = mapped_column(Text)
 
     equipments: Mapped[List["Equipment"]] = relationship(secondary=room_equipment, back_populates="rooms")
-    softwares: Mapped[List["Software"]] = relationship(secondary=room_software, back_populates="rooms")
+    softwares: Mapped[List["Software"]] = relationship(
+        secondary=room_software, back_populates="rooms", lazy="selectin"
+    )
     sessions: Mapped[List["Session"]] = relationship(back_populates="room", cascade="all, delete-orphan")
     preferred_for_course_names: Mapped[List["CourseName"]] = relationship(
         "CourseName",
@@ -217,6 +407,38 @@ class Room(db.Model, TimeStampedModel):
         back_populates="preferred_rooms",
     )
 
+    @cached_property
+    def _session_timeline(
+        self,
+    ) -> tuple[list[datetime], list[datetime], tuple[Session, ...]]:
+        """Sessions sorted by start, with the running max end."""
+
+        return _build_session_timeline(self.sessions)
+
+    def has_session_during(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        ignore_session_id: Optional[int] = None,
+    ) -> bool:
+        """Whether any of the room's sessions overlaps ``[start, end)``."""
+
+        return any(
+            not ignore_session_id or session.id != ignore_session_id
+            for session in _timeline_overlapping(self._session_timeline, start, end)
+        )
+
+    @cached_property
+    def _software_names(self) -> tuple[str, ...]:
+        """Sorted installed software names, shared by every session event."""
+
+        return tuple(sorted(map(attrgetter("name"), self.softwares)))
+
+    @cached_property
+    def _software_ids(self) -> frozenset[int]:
+        return frozenset(map(attrgetter("id"), self.softwares))
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"Room<{self.id} {self.name}>"
 
@@ -241,9 +463,18 @@ SEMESTER_PLANNING_WINDOWS: dict[str, tuple[date, date]] = {
 }
 
 
+_SEMESTER_WINDOW_LOOKUP: dict[str, tuple[date, date]] = {
+    **SEMESTER_PLANNING_WINDOWS,
+    **{key.lower(): window for key, window in SEMESTER_PLANNING_WINDOWS.items()},
+}
+
+
 def semester_date_window(semester: str | None) -> tuple[date, date] | None:
     if not semester:
         return None
+    window = _SEMESTER_WINDOW_LOOKUP.get(semester)
+    if window is not None:
+        return window
     return SEMESTER_PLANNING_WINDOWS.get(semester.strip().upper())
 
 
@@ -269,7 +500,9 @@ class Course(db.Model, TimeStampedModel):
         "CourseName", back_populates="courses"
     )
     teachers: Mapped[List[Teacher]] = relationship(secondary=course_teacher, back_populates="courses")
-    softwares: Mapped[List["Software"]] = relationship(secondary=course_software, back_populates="courses")
+    softwares: Mapped[List["Software"]] = relationship(
+        secondary=course_software, back_populates="courses", lazy="selectin"
+    )
     equipments: Mapped[List["Equipment"]] = relationship(secondary=course_equipment, back_populates="courses")
     teacher_allocations: Mapped[List["CourseTeacherAllocation"]] = relationship(
         "CourseTeacherAllocation",
@@ -280,13 +513,18 @@ class Course(db.Model, TimeStampedModel):
         "CourseClassLink",
         back_populates="course",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
     classes = association_proxy(
         "class_links",
         "class_group",
         creator=lambda class_group: CourseClassLink(class_group=class_group),
     )
-    sessions: Mapped[List["Session"]] = relationship(back_populates="course", cascade="all, delete-orphan")
+    sessions: Mapped[List["Session"]] = relationship(
+        back_populates="course",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     generation_logs: Mapped[List["CourseScheduleLog"]] = relationship(
         "CourseScheduleLog",
@@ -336,12 +574,10 @@ class Course(db.Model, TimeStampedModel):
     @property
     def base_display_name(self) -> str:
         name = self.name or ""
-        prefix = f"{self.course_type} - " if self.course_type else ""
-        suffix = f" - {self.semester}" if self.semester else ""
-        if prefix and name.startswith(prefix):
-            name = name[len(prefix) :]
-        if suffix and name.endswith(suffix):
-            name = name[: len(name) - len(suffix)]
+        if self.course_type:
+            name = name.removeprefix(f"{self.course_type} - ")
+        if self.semester:
+            name = name.removesuffix(f" - {self.semester}")
         return name.strip()
 
     @property
@@ -356,6 +592,12 @@ class Course(db.Model, TimeStampedModel):
     def is_sae(self) -> bool:
         return self.course_type == "SAE"
 
+    @cached_property
+    def _software_names(self) -> tuple[str, ...]:
+        """Sorted required software names, shared by every session event."""
+
+        return tuple(sorted(map(attrgetter("name"), self.softwares)))
+
     @property
     def semester_window(self) -> tuple[date, date] | None:
         return semester_date_window(self.semester)
@@ -374,8 +616,24 @@ class Course(db.Model, TimeStampedModel):
             return None
         return window[1]
 
+    def _class_link_index(self) -> dict[int, "CourseClassLink"] | None:
+        index = self.__dict__.get("_class_links_by_group")
+        if index is not None:
+            return index
+        index = {}
+        for link in self.class_links:
+            if link.class_group_id is None:
+                # Pending links only get their key once flushed.
+                return None
+            index[link.class_group_id] = link
+        self.__dict__["_class_links_by_group"] = index
+        return index
+
     def class_link_for(self, class_group: "ClassGroup" | int) -> "CourseClassLink" | None:
         class_id = class_group if isinstance(class_group, int) else class_group.id
+        index = self._class_link_index()
+        if index is not None:
+            return index.get(class_id)
         for link in self.class_links:
             if link.class_group_id == class_id:
                 return link
@@ -426,7 +684,8 @@ class Course(db.Model, TimeStampedModel):
     def capacity_needed_for(self, class_group: "ClassGroup" | int) -> int:
         link = self.class_link_for(class_group)
         if isinstance(class_group, int):
-            target = next((cls for cls in self.classes if cls.id == class_group), None)
+            # Only linked classes count, so resolve the id through its link.
+            target = link.class_group if link is not None else None
         else:
             target = class_group
         if target is None:
@@ -446,23 +705,91 @@ class Course(db.Model, TimeStampedModel):
             numeric = 0
         return max(numeric, 1)
 
-    @property
+    @hybrid_property
     def scheduled_hours(self) -> int:
-        return sum(session.duration_hours for session in self.sessions)
+        if self.id is None or "sessions" in inspect(self).dict:
+            return sum(session.duration_hours for session in self.sessions)
+        total = db.session.scalar(
+            select(func.coalesce(func.sum(Session.duration_hours), 0)).where(
+                Session.course_id == self.id
+            )
+        )
+        return int(total or 0)
 
-    @property
+    @scheduled_hours.inplace.expression
+    @classmethod
+    def _scheduled_hours_expression(cls):
+        return (
+            select(func.coalesce(func.sum(Session.duration_hours), 0))
+            .where(Session.course_id == cls.id)
+            .scalar_subquery()
+        )
+
+    @classmethod
+    def hours_map(cls, course_ids: Iterable[int]) -> dict[int, tuple[int, int]]:
+        """Return ``{course_id: (required, scheduled)}`` hours in one query.
+
+        List pages use this instead of reading both properties per course,
+        which would issue two aggregate queries for every row.
+        """
+
+        course_ids = list(course_ids)
+        if not course_ids:
+            return {}
+        rows = db.session.execute(
+            select(cls.id, cls.total_required_hours, cls.scheduled_hours).where(
+                cls.id.in_(course_ids)
+            )
+        )
+        return {
+            course_id: (int(required or 0), int(scheduled or 0))
+            for course_id, required, scheduled in rows
+        }
+
+    def _group_total(self) -> int:
+        if self.id is None or "class_links" in inspect(self).dict:
+            return sum(link.group_count for link in self.class_links)
+        total = db.session.scalar(
+            select(func.coalesce(func.sum(CourseClassLink.group_count), 0)).where(
+                CourseClassLink.course_id == self.id
+            )
+        )
+        return int(total or 0)
+
+    def _allowed_week_occurrences(self, per_week_goal: int) -> int | None:
+        """Return the sessions planned over the allowed weeks, if any are set."""
+
+        if self.id is None or "allowed_weeks" in inspect(self).dict:
+            if not self.allowed_weeks:
+                return None
+            return sum(
+                entry.effective_sessions(per_week_goal)
+                for entry in self.allowed_weeks
+            )
+        week_count, occurrences = db.session.execute(
+            select(
+                func.count(CourseAllowedWeek.id),
+                func.coalesce(
+                    func.sum(
+                        func.coalesce(CourseAllowedWeek.sessions_target, per_week_goal)
+                    ),
+                    0,
+                ),
+            ).where(CourseAllowedWeek.course_id == self.id)
+        ).one()
+        if not week_count:
+            return None
+        return int(occurrences or 0)
+
+    @hybrid_property
     def total_required_hours(self) -> int:
-        group_total = sum(link.group_count for link in self.class_links)
         if self.is_cm:
             multiplier = 1
         else:
-            multiplier = group_total or 1
+            multiplier = self._group_total() or 1
         per_week_goal = max(int(self.sessions_per_week or 0), 0)
-        if self.allowed_weeks:
-            occurrences = sum(
-                entry.effective_sessions(per_week_goal)
-                for entry in self.allowed_weeks
-            )
+        occurrences = self._allowed_week_occurrences(per_week_goal)
+        if occurrences is not None:
             if occurrences <= 0:
                 occurrences = max(int(self.sessions_required or 0), 1)
         else:
@@ -473,11 +800,57 @@ class Course(db.Model, TimeStampedModel):
             )
         return occurrences * self.session_length_hours * multiplier
 
+    @total_required_hours.inplace.expression
+    @classmethod
+    def _total_required_hours_expression(cls):
+        """SQL mirror of ``total_required_hours`` for aggregate queries."""
+
+        def at_least(value, floor):
+            return case((value > floor, value), else_=floor)
+
+        per_week_goal = at_least(func.coalesce(cls.sessions_per_week, 0), 0)
+        week_count = (
+            select(func.count(CourseAllowedWeek.id))
+            .where(CourseAllowedWeek.course_id == cls.id)
+            .scalar_subquery()
+        )
+        week_occurrences = (
+            select(
+                func.coalesce(
+                    func.sum(
+                        case(
+                            (CourseAllowedWeek.sessions_target.is_(None), per_week_goal),
+                            else_=at_least(CourseAllowedWeek.sessions_target, 0),
+                        )
+                    ),
+                    0,
+                )
+            )
+            .where(CourseAllowedWeek.course_id == cls.id)
+            .scalar_subquery()
+        )
+        sessions_required = func.coalesce(cls.sessions_required, 0)
+        occurrences = case(
+            (week_count == 0, at_least(at_least(sessions_required, per_week_goal), 1)),
+            (week_occurrences <= 0, at_least(sessions_required, 1)),
+            else_=week_occurrences,
+        )
+        group_total = (
+            select(func.coalesce(func.sum(CourseClassLink.group_count), 0))
+            .where(CourseClassLink.course_id == cls.id)
+            .scalar_subquery()
+        )
+        multiplier = case(
+            (cls.course_type == "CM", 1),
+            else_=at_least(group_total, 1),
+        )
+        return occurrences * cls.session_length_hours * multiplier
+
     @property
     def latest_generation_log(self) -> "CourseScheduleLog | None":
         return self.generation_logs[0] if self.generation_logs else None
 
-    @property
+    @cached_property
     def teacher_allocation_map(self) -> dict[int, int]:
         mapping: dict[int, int] = {}
         for allocation in self.teacher_allocations:
@@ -489,23 +862,30 @@ class Course(db.Model, TimeStampedModel):
 
 class Session(db.Model, TimeStampedModel):
     id: Mapped[int] = mapped_column(primary_key=True)
-    course_id: Mapped[int] = mapped_column(ForeignKey("course.id"), nullable=False)
+    course_id: Mapped[int] = mapped_column(
+        ForeignKey("course.id", ondelete="CASCADE"), nullable=False
+    )
     teacher_id: Mapped[int] = mapped_column(ForeignKey("teacher.id"), nullable=False)
     room_id: Mapped[int] = mapped_column(ForeignKey("room.id"), nullable=False)
     class_group_id: Mapped[int] = mapped_column(ForeignKey("class_group.id"), nullable=False)
     subgroup_label: Mapped[Optional[str]] = mapped_column(String(1))
     start_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     end_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    duration_hours: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
-    course: Mapped[Course] = relationship(back_populates="sessions")
+    course: Mapped[Course] = relationship(back_populates="sessions", lazy="selectin")
     teacher: Mapped[Teacher] = relationship(back_populates="sessions")
-    room: Mapped[Room] = relationship(back_populates="sessions")
+    room: Mapped[Room] = relationship(back_populates="sessions", lazy="selectin")
     class_group: Mapped["ClassGroup"] = relationship(back_populates="sessions")
     attendees: Mapped[List["ClassGroup"]] = relationship(
         "ClassGroup",
         secondary=session_attendance,
         back_populates="attending_sessions",
         order_by="ClassGroup.name",
+        lazy="selectin",
+        passive_deletes=True,
     )
 
     __table_args__ = (
@@ -517,23 +897,75 @@ class Session(db.Model, TimeStampedModel):
             "start_time",
             name="uq_class_start_time",
         ),
+        Index("ix_session_class_group_start", "class_group_id", "start_time"),
+        Index("ix_session_teacher_start", "teacher_id", "start_time"),
     )
 
-    def attendee_ids(self) -> Set[int]:
+    @classmethod
+    def with_event_loads(cls, stmt):
+        """Apply the loader options covering everything ``as_event`` reads.
+
+        ``stmt`` may be any session query or ``select`` so that each
+        relationship is fetched with one ``IN`` query for the whole page.
+        Under ``RAISELOAD_STRICT`` every other relationship raises on access.
+        """
+
+        course_links = selectinload(cls.course).selectinload(Course.class_links)
+        stmt = stmt.options(
+            selectinload(cls.course).selectinload(Course.softwares),
+            course_links.selectinload(CourseClassLink.teacher_a),
+            course_links.selectinload(CourseClassLink.teacher_b),
+            course_links.selectinload(CourseClassLink.subgroup_a_course_name),
+            course_links.selectinload(CourseClassLink.subgroup_b_course_name),
+            selectinload(cls.room).selectinload(Room.softwares),
+            selectinload(cls.attendees),
+            joinedload(cls.teacher),
+            selectinload(cls.class_group),
+        )
+        if has_app_context() and current_app.config.get("RAISELOAD_STRICT"):
+            stmt = stmt.options(Load(cls).raiseload("*", sql_only=True))
+        return stmt
+
+    @classmethod
+    def hydrated_query(cls):
+        """Return a session query eager-loading everything ``as_event`` reads."""
+
+        return cls.with_event_loads(cls.query)
+
+    @cached_property
+    def _attendee_ids(self) -> frozenset[int]:
         if self.attendees:
-            return {class_group.id for class_group in self.attendees}
+            return frozenset(class_group.id for class_group in self.attendees)
         if self.class_group_id:
-            return {self.class_group_id}
-        return set()
+            return frozenset((self.class_group_id,))
+        return frozenset()
 
-    def attendee_names(self) -> List[str]:
+    @cached_property
+    def _attendee_names(self) -> tuple[str, ...]:
         attendees = self.attendees or ([self.class_group] if self.class_group else [])
-        return [class_group.name for class_group in sorted(attendees, key=lambda cg: cg.name.lower())]
+        return tuple(
+            class_group.name for class_group in sorted(attendees, key=attrgetter("sort_key"))
+        )
+
+    def attendee_ids(self) -> frozenset[int]:
+        return self._attendee_ids
 
-    def title_with_room(self, room_label: str | None = None) -> str:
+    def attendee_names(self) -> List[str]:
+        return list(self._attendee_names)
+
+    def title_with_room(
+        self,
+        room_label: str | None = None,
+        *,
+        attendee_names: List[str] | None = None,
+        subgroup_name: str | None = None,
+    ) -> str:
         room_name = room_label or self.room.name
-        class_label = " + ".join(self.attendee_names()) or self.class_group.name
-        subgroup_name = self.subgroup_display_name()
+        if attendee_names is None:
+            attendee_names = self.attendee_names()
+        class_label = " + ".join(attendee_names) or self.class_group.name
+        if subgroup_name is None:
+            subgroup_name = self.subgroup_display_name()
         if subgroup_name:
             group_suffix = f" — {subgroup_name}"
         elif self.subgroup_label:
@@ -542,135 +974,130 @@ class Session(db.Model, TimeStampedModel):
             group_suffix = ""
         return f"{self.course.name} — {class_label}{group_suffix} ({room_name})"
 
+    @cached_property
+    def normalised_subgroup_label(self) -> Optional[str]:
+        """Stripped, upper-cased subgroup label, or ``None`` for whole groups."""
+
+        return _normalise_subgroup_label(self.subgroup_label)
+
     def subgroup_display_name(self) -> Optional[str]:
         if not self.subgroup_label:
             return None
-        course = getattr(self, "course", None)
+        course = self.course
         if course is None:
             return None
         return course.subgroup_name_for(self.class_group_id, self.subgroup_label)
 
     def as_event(self) -> dict[str, object]:
-        title = self.title_with_room()
-        course_softwares = sorted(software.name for software in self.course.softwares)
-        room_softwares = sorted(software.name for software in self.room.softwares)
-        room_software_ids = {software.id for software in self.room.softwares}
-        missing_softwares = sorted(
-            software.name
-            for software in self.course.softwares
-            if software.id not in room_software_ids
-        )
+        course = self.course
+        room = self.room
+        course_softwares_raw = course.softwares
+        course_softwares = list(course._software_names)
+        room_softwares = list(room._software_names)
+        if course_softwares_raw:
+            room_software_ids = room._software_ids
+            missing_softwares = sorted(
+                software.name
+                for software in course_softwares_raw
+                if software.id not in room_software_ids
+            )
+        else:
+            missing_softwares = []
         class_names = self.attendee_names()
+        subgroup_label = self.subgroup_label
+        subgroup_name = self.subgroup_display_name()
+        title = self.title_with_room(
+            attendee_names=class_names, subgroup_name=subgroup_name
+        )
 
-        teacher_entries: list[dict[str, object]] = []
-        seen_teacher_ids: set[int] = set()
+        teachers_by_id: dict[int, dict[str, object]] = {}
         primary_teacher = self.teacher
         if primary_teacher is not None:
-            seen_teacher_ids.add(primary_teacher.id)
-            teacher_entries.append(
-                {
-                    "id": primary_teacher.id,
-                    "name": primary_teacher.name,
-                    "email": primary_teacher.email,
-                    "phone": primary_teacher.phone,
-                }
-            )
+            teachers_by_id[primary_teacher.id] = _teacher_event_entry(primary_teacher)
 
-        related_class_ids: set[int] = set()
+        class_group_id = self.class_group_id
         related_class_labels: dict[int, str | None] = {}
-        if self.class_group_id:
-            related_class_ids.add(self.class_group_id)
-            related_class_labels[self.class_group_id] = self.subgroup_label
+        if class_group_id:
+            related_class_labels[class_group_id] = subgroup_label
         for attendee in self.attendees or []:
             if attendee.id:
-                related_class_ids.add(attendee.id)
                 related_class_labels.setdefault(
                     attendee.id,
-                    self.subgroup_label if attendee.id == self.class_group_id else None,
+                    subgroup_label if attendee.id == class_group_id else None,
                 )
 
-        if self.course is not None and related_class_ids:
-            for link in self.course.class_links:
-                if link.class_group_id not in related_class_ids:
+        if course is not None and related_class_labels:
+            is_sae = course.is_sae
+            for link in course.class_links:
+                if link.class_group_id not in related_class_labels:
                     continue
-                if self.course.is_sae:
+                if is_sae:
                     candidate_teachers = link.assigned_teachers()
                 else:
-                    subgroup_label = related_class_labels.get(link.class_group_id)
-                    preferred_teacher = link.teacher_for_label(subgroup_label)
+                    preferred_teacher = link.teacher_for_label(
+                        related_class_labels[link.class_group_id]
+                    )
                     if preferred_teacher is not None:
                         candidate_teachers = [preferred_teacher]
                     else:
                         candidate_teachers = link.assigned_teachers()
                 for teacher in candidate_teachers:
-                    if teacher is None or teacher.id in seen_teacher_ids:
-                        continue
-                    seen_teacher_ids.add(teacher.id)
-                    teacher_entries.append(
-                        {
-                            "id": teacher.id,
-                            "name": teacher.name,
-                            "email": teacher.email,
-                            "phone": teacher.phone,
-                        }
-                    )
+                    if teacher is not None and teacher.id not in teachers_by_id:
+                        teachers_by_id[teacher.id] = _teacher_event_entry(teacher)
 
-        primary_entry: dict[str, object] | None = teacher_entries[0] if teacher_entries else None
-        primary_name = (
-            primary_entry.get("name") if isinstance(primary_entry, dict) else None
-        )
-        primary_email = (
-            primary_entry.get("email") if isinstance(primary_entry, dict) else None
-        )
-        primary_phone = (
-            primary_entry.get("phone") if isinstance(primary_entry, dict) else None
-        )
+        teacher_entries = list(teachers_by_id.values())
+        primary_entry = teacher_entries[0] if teacher_entries else {}
+        session_id = str(self.id)
+        start = self.start_time
+        end = self.end_time
+        course_type = course.course_type
 
         return {
-            "id": str(self.id),
+            "id": session_id,
             "title": title,
-            "start": self.start_time.isoformat(),
-            "end": self.end_time.isoformat(),
+            "start": start,
+            "end": end,
             "extendedProps": {
-                "teacher": primary_name,
-                "teacher_email": primary_email,
-                "teacher_phone": primary_phone,
+                "teacher": primary_entry.get("name"),
+                "teacher_email": primary_entry.get("email"),
+                "teacher_phone": primary_entry.get("phone"),
                 "teachers": teacher_entries,
-                "course": self.course.name,
-                "course_type": self.course.course_type,
-                "course_type_label": COURSE_TYPE_LABELS.get(
-                    self.course.course_type, self.course.course_type
-                ),
-                "course_description": self.course.description,
-                "requires_computers": self.course.requires_computers,
-                "computers_required": self.course.required_computer_posts(),
-                "room_computers": self.room.computers,
+                "course": course.name,
+                "course_type": course_type,
+                "course_type_label": COURSE_TYPE_LABELS.get(course_type, course_type),
+                "course_description": course.description,
+                "requires_computers": course.requires_computers,
+                "computers_required": course.required_computer_posts(),
+                "room_computers": room.computers,
                 "course_softwares": course_softwares,
                 "room_softwares": room_softwares,
                 "missing_softwares": missing_softwares,
-                "room": self.room.name,
-                "rooms": [self.room.name],
+                "room": room.name,
+                "rooms": [room.name],
                 "class_group": ", ".join(class_names),
                 "class_groups": class_names,
-                "subgroup": self.subgroup_label,
-                "subgroup_name": self.subgroup_display_name(),
+                "subgroup": subgroup_label,
+                "subgroup_name": subgroup_name,
                 "segments": [
                     {
-                        "id": str(self.id),
-                        "start": self.start_time.isoformat(),
-                        "end": self.end_time.isoformat(),
-                        "room": self.room.name,
+                        "id": session_id,
+                        "start": start,
+                        "end": end,
+                        "room": room.name,
                     }
                 ],
-                "segment_ids": [str(self.id)],
+                "segment_ids": [session_id],
                 "is_grouped": False,
             },
         }
 
-    @property
-    def duration_hours(self) -> int:
-        delta = self.end_time - self.start_time
-        return max(int(delta.total_seconds() // 3600), 0)
+    @validates("start_time", "end_time")
+    def _sync_duration_hours(self, key: str, value: datetime | None) -> datetime | None:
+        start = value if key == "start_time" else self.start_time
+        end = value if key == "end_time" else self.end_time
+        if start is not None and end is not None:
+            self.duration_hours = max(int((end - start).total_seconds() // 3600), 0)
+        return value
 
 
 class CourseScheduleLog(db.Model, TimeStampedModel):
@@ -678,7 +1105,7 @@ class CourseScheduleLog(db.Model, TimeStampedModel):
     course_id: Mapped[int] = mapped_column(ForeignKey("course.id"), nullable=False, index=True)
     status: Mapped[str] = mapped_column(String(20), default="success")
     summary: Mapped[Optional[str]] = mapped_column(Text)
-    messages: Mapped[str] = mapped_column(Text, default="[]", nullable=False)
+    messages: Mapped[list] = mapped_column(JSONText, default=list, nullable=False)
     window_start: Mapped[Optional[date]] = mapped_column(Date)
     window_end: Mapped[Optional[date]] = mapped_column(Date)
 
@@ -704,28 +1131,38 @@ class CourseScheduleLog(db.Model, TimeStampedModel):
     }
 
     def parsed_messages(self) -> list[dict[str, object]]:
-        try:
-            payload = json.loads(self.messages or "[]")
-        except (TypeError, ValueError):
-            return []
+        raw = self.messages
+        cached = self.__dict__.get("_parsed_messages_cache")
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        normalised = self._normalise_messages(raw)
+        self.__dict__["_parsed_messages_cache"] = (raw, normalised)
+        return normalised
+
+    @staticmethod
+    def _normalise_messages(payload: object) -> list[dict[str, object]]:
         if not isinstance(payload, list):
             return []
         normalised: list[dict[str, object]] = []
         for entry in payload:
             if not isinstance(entry, dict):
                 continue
-            level = str(entry.get("level", "info")).lower()
             message = str(entry.get("message", "")).strip()
             if not message:
                 continue
-            normalised_entry: dict[str, object] = {"level": level, "message": message}
+            normalised_entry: dict[str, object] = {
+                "level": str(entry.get("level", "info")).lower(),
+                "message": message,
+            }
             suggestions = entry.get("suggestions")
             if isinstance(suggestions, list):
-                unique: list[str] = []
-                for suggestion in suggestions:
-                    cleaned = str(suggestion).strip()
-                    if cleaned and cleaned not in unique:
-                        unique.append(cleaned)
+                unique = list(
+                    dict.fromkeys(
+                        cleaned
+                        for suggestion in suggestions
+                        if (cleaned := str(suggestion).strip())
+                    )
+                )
                 if unique:
                     normalised_entry["suggestions"] = unique
             normalised.append(normalised_entry)
@@ -826,10 +1263,6 @@ class CourseName(db.Model, TimeStampedModel):
         back_populates="subgroup_b_course_name",
     )
 
-    @property
-    def usage_count(self) -> int:
-        return len(self.subgroup_links_a) + len(self.subgroup_links_b)
-
     def __repr__(self) -> str:  # pragma: no cover
         return f"CourseName<{self.name}>"
 
@@ -846,10 +1279,24 @@ class TeacherAvailability(db.Model, TimeStampedModel):
     __table_args__ = (
         CheckConstraint("end_time > start_time", name="chk_availability_time_order"),
         CheckConstraint("weekday >= 0 AND weekday <= 6", name="chk_availability_weekday_range"),
+        Index("ix_teacher_availability_teacher_weekday", "teacher_id", "weekday"),
     )
 
     def contains(self, start: time, end: time) -> bool:
-        return self.start_time <= start and end <= self.end_time
+        slot_start, slot_end = self.second_span
+        return (
+            slot_start <= _seconds_since_midnight(start)
+            and _seconds_since_midnight(end) <= slot_end
+        )
+
+    @cached_property
+    def second_span(self) -> tuple[int, int]:
+        """``(start, end)`` as seconds since midnight, for overlap arithmetic."""
+
+        return (
+            _seconds_since_midnight(self.start_time),
+            _seconds_since_midnight(self.end_time),
+        )
 
     def __repr__(self) -> str:  # pragma: no cover
         return (
@@ -858,15 +1305,266 @@ class TeacherAvailability(db.Model, TimeStampedModel):
         )
 
 
-def _availability_overlap_hours(
-    first: TeacherAvailability, second: TeacherAvailability
-) -> float:
-    start = max(first.start_time, second.start_time)
-    end = min(first.end_time, second.end_time)
-    if end <= start:
-        return 0.0
-    delta = datetime.combine(date.min, end) - datetime.combine(date.min, start)
-    return delta.total_seconds() / 3600
+def _seconds_since_midnight(value: time | datetime) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _normalise_subgroup_label(label: str | None) -> str | None:
+    """Return the stripped, upper-cased subgroup label, or ``None`` if blank."""
+
+    # Stored labels are almost always already canonical.
+    if label is None or label == "A" or label == "B":
+        return label
+    return label.strip().upper() or None
+
+
+def _build_session_timeline(
+    sessions: Iterable[Session],
+) -> tuple[list[datetime], list[datetime], tuple[Session, ...]]:
+    """Sort ``sessions`` by start and pair each one with the running max end."""
+
+    # A stable sort on the start alone is cheaper than building a tuple key
+    # per session; simultaneous sessions keep their collection order, which
+    # neither the overlap walk nor the day and week scans depend on.
+    ordered = tuple(sorted(sessions, key=attrgetter("start_time")))
+    starts = [session.start_time for session in ordered]
+    running_ends: list[datetime] = []
+    latest: datetime | None = None
+    for session in ordered:
+        if latest is None or session.end_time > latest:
+            latest = session.end_time
+        running_ends.append(latest)
+    return starts, running_ends, ordered
+
+
+def _timeline_overlapping(
+    timeline: tuple[list[datetime], list[datetime], tuple[Session, ...]],
+    start: datetime,
+    end: datetime,
+) -> Iterable[Session]:
+    """Yield the timeline sessions overlapping ``[start, end)``, latest first."""
+
+    starts, running_ends, ordered = timeline
+    # Only sessions starting before ``end`` can overlap; walk them back
+    # until no earlier session can still be running at ``start``.
+    index = bisect_left(starts, end)
+    while index > 0:
+        index -= 1
+        if running_ends[index] <= start:
+            break
+        session = ordered[index]
+        if session.end_time > start:
+            yield session
+
+
+def _teacher_event_entry(teacher: Teacher) -> dict[str, object]:
+    return {
+        "id": teacher.id,
+        "name": teacher.name,
+        "email": teacher.email,
+        "phone": teacher.phone,
+    }
+
+
+def _slot_seconds_by_weekday(
+    availabilities: Iterable[TeacherAvailability],
+) -> dict[int, list[tuple[int, int]]]:
+    slots: dict[int, list[tuple[int, int]]] = {}
+    for availability in availabilities:
+        start, end = availability.second_span
+        if end <= start:
+            continue
+        slots.setdefault(availability.weekday, []).append((start, end))
+    return slots
+
+
+def _shared_seconds(
+    first: Iterable[tuple[int, int]], second: Iterable[tuple[int, int]]
+) -> int:
+    """Return the summed pairwise overlap of two slot lists, in seconds.
+
+    A single sweep over the sorted slot boundaries integrates the product of
+    the number of open slots on each side, which equals the sum of every
+    ``(first, second)`` pair overlap without comparing the pairs one by one.
+    """
+
+    boundaries: list[tuple[int, int, int]] = []
+    for start, end in first:
+        boundaries.append((start, 1, 0))
+        boundaries.append((end, -1, 0))
+    for start, end in second:
+        boundaries.append((start, 0, 1))
+        boundaries.append((end, 0, -1))
+    boundaries.sort()
+
+    total = 0
+    open_first = open_second = 0
+    previous = 0
+    for instant, first_delta, second_delta in boundaries:
+        if open_first and open_second:
+            total += open_first * open_second * (instant - previous)
+        open_first += first_delta
+        open_second += second_delta
+        previous = instant
+    return total
+
+
+def _teachers_by_identifier(teachers: Iterable[Teacher | None]) -> dict[int, Teacher]:
+    """Distinct teachers keyed by id, or by object identity before flush."""
+
+    return {
+        teacher.id or id(teacher): teacher for teacher in teachers if teacher is not None
+    }
+
+
+def _pairwise_shared_seconds(teachers: list[Teacher]) -> list[list[int]]:
+    """Symmetric matrix of shared availability, in seconds, between ``teachers``.
+
+    Each teacher's slots are converted once instead of once per pair.
+    """
+
+    slot_maps = [_slot_seconds_by_weekday(teacher.availabilities) for teacher in teachers]
+    count = len(teachers)
+    shared = [[0] * count for _ in range(count)]
+    for first_index in range(count):
+        first_slots = slot_maps[first_index]
+        if not first_slots:
+            continue
+        for second_index in range(first_index + 1, count):
+            second_slots = slot_maps[second_index]
+            total = 0
+            for weekday, slots in first_slots.items():
+                theirs = second_slots.get(weekday)
+                if theirs:
+                    total += _shared_seconds(slots, theirs)
+            shared[first_index][second_index] = total
+            shared[second_index][first_index] = total
+    return shared
+
+
+_UNSET = object()
+
+
+def _best_pairing(
+    weights: list[list[int]],
+    pairs_needed: int,
+    pair_key: Callable[[tuple[int, int]], object] | None = None,
+) -> list[tuple[int, int]]:
+    """Pick ``pairs_needed`` disjoint index pairs maximising the summed weight.
+
+    ``weights`` is a symmetric integer matrix. Pairs are ``(lower, higher)``
+    index tuples, and among optimal pairings the one whose pairs, sorted by
+    ``pair_key`` (the pair itself by default), form the smallest sequence is
+    returned. Pairs come out in that ``pair_key`` order.
+    """
+
+    # One memo per number of pairs left, keyed by the mask alone, so lookups
+    # do not allocate a (mask, remaining) tuple on every call.
+    best_totals: list[dict[int, int | None]] = [{} for _ in range(pairs_needed + 1)]
+    top_weight = max((max(row) for row in weights), default=0)
+
+    # An optimal pairing touches at most 2 * pairs_needed - 2 indices besides
+    # a pair's endpoints, so a partner weighing less than an endpoint's
+    # (2 * pairs_needed - 1)-th best could be swapped for a strictly better
+    # free one. Only the remaining candidate partners are ever explored.
+    count = len(weights)
+    kept = 2 * pairs_needed - 1
+    partners: list[int] = []
+    for index, row in enumerate(weights):
+        others = [weight for other, weight in enumerate(row) if other != index]
+        threshold = sorted(others, reverse=True)[kept - 1] if 0 < kept < len(others) else None
+        partner_mask = 0
+        for other in range(count):
+            if other != index and (threshold is None or row[other] >= threshold):
+                partner_mask |= 1 << other
+        partners.append(partner_mask)
+    # Candidate partners by decreasing weight, so a strong incumbent is found
+    # first and the remaining candidates can be cut off by the bound below.
+    ranked_partners = [
+        sorted(
+            (
+                (1 << other, weights[index][other])
+                for other in range(count)
+                if partner_mask >> other & 1
+            ),
+            key=lambda item: -item[1],
+        )
+        for index, partner_mask in enumerate(partners)
+    ]
+
+    def best_total(mask: int, remaining: int) -> int | None:
+        """Best summed weight for ``remaining`` disjoint pairs taken from ``mask``."""
+
+        if remaining == 0:
+            return 0
+        if mask.bit_count() < remaining * 2:
+            return None
+        memo = best_totals[remaining]
+        if mask in memo:
+            return memo[mask]
+        # No pairing can beat every pair sharing the largest weight, so stop
+        # scanning as soon as that bound is reached (common when teachers
+        # have identical availabilities).
+        bound = remaining * top_weight
+        lowest_bit = mask & -mask
+        first_index = lowest_bit.bit_length() - 1
+        without_first = mask & ~lowest_bit
+        best: int | None = None
+        # Look up memoised sub-results inline: most of them are cache hits,
+        # and the last pair needs no sub-call at all.
+        next_memo = best_totals[remaining - 1]
+        for other_bit, weight in ranked_partners[first_index]:
+            if not without_first & other_bit:
+                continue
+            # Partners come by decreasing weight: once a pair cannot lift the
+            # total above ``best`` even if every remaining pair had the
+            # largest weight, no later partner can either.
+            if best is not None and (
+                best >= bound or weight + (remaining - 1) * top_weight <= best
+            ):
+                break
+            if remaining == 1:
+                rest = 0
+            else:
+                rest_mask = without_first & ~other_bit
+                rest = next_memo.get(rest_mask, _UNSET)
+                if rest is _UNSET:
+                    rest = best_total(rest_mask, remaining - 1)
+            if rest is None:
+                continue
+            candidate = weight + rest
+            if best is None or candidate > best:
+                best = candidate
+        if best is None or best < bound:
+            skipped = best_total(without_first, remaining)
+            if skipped is not None and (best is None or skipped > best):
+                best = skipped
+        memo[mask] = best
+        return best
+
+    mask = (1 << count) - 1
+    remaining = pairs_needed
+    target = best_total(mask, remaining)
+    if target is None:
+        return []
+    # Take pairs in ``pair_key`` order, keeping each one that still extends
+    # to an optimal pairing. A pair skipped here belongs to no optimal
+    # pairing of the remaining indices, so a single pass is enough; pruned
+    # pairs belong to none at all and are not even tried.
+    pairs: list[tuple[int, int]] = []
+    for first, second in sorted(combinations(range(count), 2), key=pair_key):
+        if not remaining:
+            break
+        pair_bits = 1 << first | 1 << second
+        if mask & pair_bits != pair_bits or not partners[first] >> second & 1:
+            continue
+        rest = best_total(mask & ~pair_bits, remaining - 1)
+        if rest is not None and weights[first][second] + rest == target:
+            pairs.append((first, second))
+            mask &= ~pair_bits
+            remaining -= 1
+            target = rest
+    return pairs
 
 
 def best_teacher_duos(
@@ -880,33 +1578,20 @@ def best_teacher_duos(
     retrieve every combination.
     """
 
-    unique: list[Teacher] = []
-    seen: set[int] = set()
-    for teacher in teachers:
-        if teacher is None:
-            continue
-        teacher_id = teacher.id or id(teacher)
-        if teacher_id in seen:
-            continue
-        seen.add(teacher_id)
-        unique.append(teacher)
-
-    pairs: list[tuple[Teacher, Teacher, float]] = []
-    for first, second in combinations(unique, 2):
-        overlap = first.overlapping_available_hours(second)
-        pairs.append((first, second, overlap))
-
-    pairs.sort(
-        key=lambda item: (
-            -item[2],
-            (item[0].name or "").lower(),
-            (item[1].name or "").lower(),
-        )
-    )
+    unique = list(_teachers_by_identifier(teachers).values())
 
+    shared = _pairwise_shared_seconds(unique)
+    names = [(teacher.name or "").lower() for teacher in unique]
+    ranked = sorted(
+        combinations(range(len(unique)), 2),
+        key=lambda pair: (-shared[pair[0]][pair[1]], names[pair[0]], names[pair[1]]),
+    )
     if limit is not None and limit >= 0:
-        return pairs[:limit]
-    return pairs
+        ranked = ranked[:limit]
+    return [
+        (unique[first], unique[second], shared[first][second] / 3600)
+        for first, second in ranked
+    ]
 
 
 def recommend_teacher_duos_for_classes(
@@ -920,22 +1605,14 @@ def recommend_teacher_duos_for_classes(
     overlap_hours)`` tuple. If a class cannot be assigned a duo without
     duplicating teachers, it will be omitted from the mapping. When several
     pairings are possible, the combination that maximises the mean shared
-    availability across the recommended duos is selected, breaking ties on the
-    total shared time and then alphabetically by teacher names.
+    availability across the recommended duos is selected, breaking ties
+    alphabetically by teacher names. The number of duos is fixed, so the mean
+    is compared through the total shared time in whole seconds.
     """
 
-    unique_teachers: list[Teacher] = []
-    unique_ids: list[int] = []
-    seen: set[int] = set()
-    for teacher in teachers:
-        if teacher is None:
-            continue
-        identifier = teacher.id or id(teacher)
-        if identifier in seen:
-            continue
-        seen.add(identifier)
-        unique_teachers.append(teacher)
-        unique_ids.append(identifier)
+    by_identifier = _teachers_by_identifier(teachers)
+    unique_teachers = list(by_identifier.values())
+    unique_ids = list(by_identifier)
 
     teacher_count = len(unique_teachers)
     if teacher_count < 2:
@@ -959,129 +1636,26 @@ def recommend_teacher_duos_for_classes(
     if pairs_needed == 0:
         return {}
 
-    overlaps: list[list[float]] = [
-        [0.0 for _ in range(teacher_count)] for _ in range(teacher_count)
-    ]
-    for first_index in range(teacher_count):
-        first_teacher = unique_teachers[first_index]
-        for second_index in range(first_index + 1, teacher_count):
-            second_teacher = unique_teachers[second_index]
-            overlap = first_teacher.overlapping_available_hours(second_teacher)
-            overlaps[first_index][second_index] = overlap
-            overlaps[second_index][first_index] = overlap
+    shared = _pairwise_shared_seconds(unique_teachers)
 
     teacher_sort_key = [
         ((teacher.name or "").lower(), unique_ids[index])
         for index, teacher in enumerate(unique_teachers)
     ]
 
-    def canonical_pairs(pairs: tuple[tuple[int, int], ...]) -> tuple[tuple[int, int], ...]:
-        return tuple(
-            sorted(
-                pairs,
-                key=lambda pair: (
-                    teacher_sort_key[pair[0]],
-                    teacher_sort_key[pair[1]],
-                ),
-            )
-        )
-
-    def signature(pairs: tuple[tuple[int, int], ...]) -> tuple[tuple[tuple[str, int], tuple[str, int]], ...]:
-        return tuple(
-            (
-                teacher_sort_key[pair[0]],
-                teacher_sort_key[pair[1]],
-            )
-            for pair in pairs
-        )
-
-    if hasattr(int, "bit_count"):
-        def popcount(value: int) -> int:
-            return value.bit_count()
-    else:  # pragma: no cover - only executed on Python < 3.8
-        def popcount(value: int) -> int:
-            count = 0
-            while value:
-                value &= value - 1
-                count += 1
-            return count
-
-    best_pairs: tuple[tuple[int, int], ...] = ()
-    best_average = float("-inf")
-    best_total = float("-inf")
-    best_signature: tuple[tuple[tuple[str, int], tuple[str, int]], ...] | None = None
-
-    def explore(mask: int, selected: tuple[tuple[int, int], ...], total: float) -> None:
-        nonlocal best_pairs, best_average, best_total, best_signature
-
-        selected_count = len(selected)
-        remaining_pairs = pairs_needed - selected_count
-        if remaining_pairs == 0:
-            if not selected:
-                return
-            canonical = canonical_pairs(selected)
-            mean_overlap = total / selected_count if selected_count else 0.0
-            candidate_signature = signature(canonical)
-            if (
-                mean_overlap > best_average
-                or (
-                    mean_overlap == best_average
-                    and (
-                        total > best_total
-                        or (
-                            total == best_total
-                            and (
-                                best_signature is None
-                                or candidate_signature < best_signature
-                            )
-                        )
-                    )
-                )
-            ):
-                best_pairs = canonical
-                best_average = mean_overlap
-                best_total = total
-                best_signature = candidate_signature
-            return
-
-        if popcount(mask) < remaining_pairs * 2:
-            return
-
-        lowest_bit = mask & -mask
-        first_index = lowest_bit.bit_length() - 1
-        without_first = mask & ~lowest_bit
-
-        explore(without_first, selected, total)
-
-        other_mask = without_first
-        while other_mask:
-            lowest_other_bit = other_mask & -other_mask
-            second_index = lowest_other_bit.bit_length() - 1
-            other_mask &= ~lowest_other_bit
-
-            pair = (
-                min(first_index, second_index),
-                max(first_index, second_index),
-            )
-            pair_score = overlaps[pair[0]][pair[1]]
-            explore(
-                without_first & ~lowest_other_bit,
-                selected + (pair,),
-                total + pair_score,
-            )
-
-    full_mask = (1 << teacher_count) - 1
-    explore(full_mask, (), 0.0)
-
-    selected_pairs = best_pairs
-
-    if not selected_pairs:
-        return {}
+    # Among equally good pairings keep the one whose pairs, each keyed by its
+    # teachers in input order, sort alphabetically first. Overlaps are
+    # compared in whole seconds to keep ties exact.
+    selected_pairs = _best_pairing(
+        shared,
+        pairs_needed,
+        lambda pair: (teacher_sort_key[pair[0]], teacher_sort_key[pair[1]]),
+    )
 
     selected_pairs_for_assignment = sorted(
         selected_pairs,
         key=lambda pair: (
-            -overlaps[pair[0]][pair[1]],
+            -shared[pair[0]][pair[1]],
             teacher_sort_key[pair[0]],
             teacher_sort_key[pair[1]],
         ),
@@ -1091,7 +1665,7 @@ def recommend_teacher_duos_for_classes(
         (
             unique_teachers[first_index],
             unique_teachers[second_index],
-            overlaps[first_index][second_index],
+            shared[first_index][second_index] / 3600,
         )
         for first_index, second_index in selected_pairs_for_assignment
     ]
@@ -1135,23 +1709,35 @@ class ClassGroup(db.Model, TimeStampedModel):
         order_by="Student.full_name",
     )
 
-    @staticmethod
-    def _overlaps(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
-        return max(a_start, b_start) < min(a_end, b_end)
+    @cached_property
+    def sort_key(self) -> str:
+        """Case-insensitive ordering key, computed once per loaded name."""
+        return (self.name or "").lower()
 
-    def _unavailable_set(self) -> set[str]:
+    @cached_property
+    def _unavailable_set(self) -> frozenset[date]:
         if not self.unavailable_dates:
-            return set()
-        tokens = self.unavailable_dates.replace("\n", ",").split(",")
-        return {token.strip() for token in tokens if token.strip()}
+            return frozenset()
+        days: set[date] = set()
+        for token in self.unavailable_dates.replace("\n", ",").split(","):
+            token = token.strip()
+            try:
+                day = date.fromisoformat(token)
+            except ValueError:
+                continue
+            # Only exact YYYY-MM-DD entries have ever matched a day.
+            if day.isoformat() == token:
+                days.add(day)
+        return frozenset(days)
 
     def is_available_on(self, day: datetime | date) -> bool:
         target_date = day.date() if isinstance(day, datetime) else day
         if target_date.weekday() >= 5:
             return False
-        if ClosingPeriod.is_day_closed(target_date):
+        if ClosingPeriod.is_day_closed_cached(target_date):
             return False
-        if target_date.strftime("%Y-%m-%d") in self._unavailable_set():
+        unavailable = self._unavailable_set
+        if unavailable and target_date in unavailable:
             return False
         return True
 
@@ -1165,51 +1751,41 @@ class ClassGroup(db.Model, TimeStampedModel):
     ) -> bool:
         if not self.is_available_on(start):
             return False
-        target_label = (subgroup_label or "").strip().upper() or None
-        seen: set[int | None] = set()
-        for session in self.sessions + self.attending_sessions:
-            if session.id in seen:
-                continue
+        target_label = _normalise_subgroup_label(subgroup_label)
+        for session in _timeline_overlapping(self._session_timeline, start, end):
             if ignore_session_id and session.id == ignore_session_id:
-                seen.add(session.id)
-                continue
-            if not self._overlaps(session.start_time, session.end_time, start, end):
-                seen.add(session.id)
                 continue
             session_label: str | None
             if session.class_group_id == self.id:
-                session_label = (session.subgroup_label or "").strip().upper() or None
+                session_label = session.normalised_subgroup_label
+            elif self.id in session.attendee_ids():
+                session_label = None
             else:
-                attendees = session.attendees or []
-                if any(att.id == self.id for att in attendees):
-                    session_label = None
-                else:
-                    seen.add(session.id)
-                    continue
+                continue
             if target_label is not None:
                 if session_label is None:
                     return False
                 if session_label != target_label:
-                    seen.add(session.id)
                     continue
             return False
-            seen.add(session.id)
         return True
 
-    @property
-    def all_sessions(self) -> List[Session]:
-        combined: list[Session] = []
-        seen: set[int] = set()
-        for session in self.sessions + self.attending_sessions:
-            if session.id in seen:
-                continue
-            combined.append(session)
-            seen.add(session.id)
-        return sorted(
-            combined,
-            key=lambda session: (session.start_time, session.id or 0),
+    @cached_property
+    def _session_timeline(
+        self,
+    ) -> tuple[list[datetime], list[datetime], tuple[Session, ...]]:
+        """Own and attended sessions sorted by start, with the running max end."""
+
+        return _build_session_timeline(
+            dict.fromkeys(chain(self.sessions, self.attending_sessions))
         )
 
+    @property
+    def all_sessions(self) -> tuple[Session, ...]:
+        """Own and attended sessions in start order, shared with the timeline."""
+
+        return self._session_timeline[2]
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"ClassGroup<{self.id} {self.name}>"
 
@@ -1303,7 +1879,7 @@ class CourseClassLink(db.Model):
     def subgroup_course_name_for(self, subgroup_label: str | None) -> CourseName | None:
         if not subgroup_label or self.group_count != 2:
             return None
-        label = (subgroup_label or "").strip().upper()
+        label = _normalise_subgroup_label(subgroup_label)
         if label == "A":
             return self.subgroup_a_course_name
         if label == "B":
@@ -1316,7 +1892,7 @@ class CourseClassLink(db.Model):
         name = self.subgroup_course_name_for(subgroup_label)
         if name is not None:
             return name.name
-        return f"Groupe {(subgroup_label or '').strip().upper()}"
+        return f"Groupe {_normalise_subgroup_label(subgroup_label) or ''}"
 
     def labeled_subgroups(self) -> list[tuple[str | None, str]]:
         return [
@@ -1330,59 +1906,58 @@ class CourseClassLink(db.Model):
             return True
         return bool(self.subgroup_a_course_name and self.subgroup_b_course_name)
 
+    @cached_property
+    def _assigned_teachers(self) -> tuple[Teacher, ...]:
+        teacher_a, teacher_b = self.teacher_a, self.teacher_b
+        if teacher_a is None:
+            return () if teacher_b is None else (teacher_b,)
+        if teacher_b is None or teacher_b is teacher_a:
+            return (teacher_a,)
+        return (teacher_a, teacher_b)
+
     def assigned_teachers(self) -> list[Teacher]:
-        teachers: list[Teacher] = []
-        for teacher in (self.teacher_a, self.teacher_b):
-            if teacher is None:
-                continue
-            if teacher not in teachers:
-                teachers.append(teacher)
-        return teachers
+        return list(self._assigned_teachers)
+
+    @cached_property
+    def _preferred_by_label(self) -> dict[str | None, tuple[Teacher, ...]]:
+        """Preferred teachers for subgroups ``A`` and ``B`` and for the rest."""
+
+        return {
+            label: tuple(self._resolve_preferred_teachers(label))
+            for label in ("A", "B", None)
+        }
 
     def preferred_teachers(self, subgroup_label: str | None = None) -> list[Teacher]:
+        return list(self._preferred_for(subgroup_label))
+
+    def _preferred_for(self, subgroup_label: str | None) -> tuple[Teacher, ...]:
+        preferred = self._preferred_by_label
+        return preferred.get(_normalise_subgroup_label(subgroup_label), preferred[None])
+
+    def _resolve_preferred_teachers(self, label: str | None) -> list[Teacher]:
         teachers = self.assigned_teachers()
-        course = getattr(self, "course", None)
-        course_type = getattr(course, "course_type", None)
-        if course_type == "SAE":
+        course = self.course
+        if course is not None and course.is_sae:
             return teachers
         if self.group_count == 2:
-            label = (subgroup_label or "").strip().upper()
-            ordered: list[Teacher] = []
             if label == "A":
-                if self.teacher_a:
-                    ordered.append(self.teacher_a)
-                if not ordered and self.teacher_b:
-                    ordered.append(self.teacher_b)
+                teacher = self.teacher_a or self.teacher_b
             elif label == "B":
-                if self.teacher_b:
-                    ordered.append(self.teacher_b)
-                if not ordered and self.teacher_a:
-                    ordered.append(self.teacher_a)
+                teacher = self.teacher_b or self.teacher_a
             else:
-                if self.teacher_a:
-                    ordered.append(self.teacher_a)
-                if self.teacher_b and self.teacher_b not in ordered:
-                    ordered.append(self.teacher_b)
-            if (
-                label in {"A", "B"}
-                and self.teacher_a
-                and self.teacher_b
-                and self.teacher_a.id != self.teacher_b.id
-            ):
-                return ordered[:1]
-            return ordered
+                return teachers
+            return [teacher] if teacher is not None else []
         if teachers:
             return teachers[:1]
         return []
 
     def teacher_for_label(self, subgroup_label: str | None) -> Optional[Teacher]:
-        teachers = self.preferred_teachers(subgroup_label)
+        teachers = self._preferred_for(subgroup_label)
         return teachers[0] if teachers else None
 
     def teacher_labels(self) -> list[tuple[str, Optional[Teacher]]]:
-        course = getattr(self, "course", None)
-        course_type = getattr(course, "course_type", None)
-        if course_type == "SAE":
+        course = self.course
+        if course is not None and course.is_sae:
             return [
                 ("Enseignant 1", self.teacher_a),
                 ("Enseignant 2", self.teacher_b),
@@ -1402,6 +1977,19 @@ class CourseClassLink(db.Model):
         )
 
 
+# Number of subgroup slots naming the course name, counted in SQL so listing
+# pages can ``undefer`` it instead of loading both link collections per row.
+CourseName.usage_count = column_property(
+    select(func.count())
+    .where(CourseClassLink.subgroup_a_course_name_id == CourseName.id)
+    .scalar_subquery()
+    + select(func.count())
+    .where(CourseClassLink.subgroup_b_course_name_id == CourseName.id)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+
 class CourseTeacherAllocation(db.Model):
     __tablename__ = "course_teacher_allocation"
 
@@ -1425,3 +2013,201 @@ class CourseTeacherAllocation(db.Model):
             f"CourseTeacherAllocation<Course {self.course_id} / Teacher {self.teacher_id}"
             f" target={self.target_hours}h>"
         )
+
+
+# Memoised helpers --------------------------------------------------------
+def _drop_cached(target: object | None, names: tuple[str, ...]) -> None:
+    # Expire events can fire for instances that have already been collected.
+    if target is None:
+        return
+    state = target.__dict__
+    for name in names:
+        state.pop(name, None)
+
+
+def _reset_cache_on_change(attribute, *names: str) -> None:
+    """Drop the memoised ``names`` whenever ``attribute`` is modified."""
+
+    def _reset(target, *args, **kwargs) -> None:
+        _drop_cached(target, names)
+
+    if getattr(attribute.property, "uselist", False):
+        event.listen(attribute, "append", _reset)
+        event.listen(attribute, "remove", _reset)
+    else:
+        event.listen(attribute, "set", _reset)
+
+
+def _reset_parent_cache_on_change(attribute, parent: str, *names: str) -> None:
+    """Drop the memoised ``names`` on the ``parent`` of a modified child row."""
+
+    def _reset(target, *args, **kwargs) -> None:
+        _drop_cached(getattr(target, parent, None), names)
+
+    event.listen(attribute, "set", _reset)
+
+
+def _reset_cache_on_expire(model: type, *names: str) -> None:
+    """Drop the memoised ``names`` when the instance is expired or refreshed."""
+
+    def _reset(target, *args, **kwargs) -> None:
+        _drop_cached(target, names)
+
+    event.listen(model, "expire", _reset)
+    event.listen(model, "refresh", _reset)
+
+
+_reset_cache_on_expire(
+    Teacher,
+    "unavailable_ranges",
+    "slots_by_weekday",
+    "_merged_slots_by_weekday",
+    "_session_timeline",
+)
+_reset_cache_on_change(Teacher.sessions, "_session_timeline")
+_reset_cache_on_expire(Room, "_session_timeline", "_software_names", "_software_ids")
+_reset_cache_on_change(Room.sessions, "_session_timeline")
+_reset_cache_on_change(Teacher.unavailable_dates, "unavailable_ranges")
+_reset_cache_on_change(
+    Teacher.availabilities, "slots_by_weekday", "_merged_slots_by_weekday"
+)
+_reset_cache_on_expire(
+    Course, "_class_links_by_group", "teacher_allocation_map", "_software_names"
+)
+_reset_cache_on_change(Course.class_links, "_class_links_by_group")
+for _attribute in (CourseClassLink.class_group_id, CourseClassLink.class_group):
+    _reset_parent_cache_on_change(_attribute, "course", "_class_links_by_group")
+_reset_cache_on_change(Course.teacher_allocations, "teacher_allocation_map")
+_reset_cache_on_change(Course.softwares, "_software_names")
+_reset_cache_on_change(Room.softwares, "_software_names", "_software_ids")
+for _attribute in (CourseTeacherAllocation.teacher_id, CourseTeacherAllocation.target_hours):
+    _reset_parent_cache_on_change(_attribute, "course", "teacher_allocation_map")
+_reset_cache_on_expire(CourseClassLink, "_assigned_teachers", "_preferred_by_label")
+for _attribute in (
+    CourseClassLink.teacher_a,
+    CourseClassLink.teacher_b,
+    CourseClassLink.teacher_a_id,
+    CourseClassLink.teacher_b_id,
+    CourseClassLink.group_count,
+    CourseClassLink.course,
+):
+    _reset_cache_on_change(_attribute, "_assigned_teachers", "_preferred_by_label")
+_reset_cache_on_expire(TeacherAvailability, "second_span")
+for _attribute in (TeacherAvailability.start_time, TeacherAvailability.end_time):
+    _reset_cache_on_change(_attribute, "second_span")
+    _reset_parent_cache_on_change(
+        _attribute, "teacher", "slots_by_weekday", "_merged_slots_by_weekday"
+    )
+_reset_cache_on_expire(
+    Session, "normalised_subgroup_label", "_attendee_ids", "_attendee_names"
+)
+for _attribute in (Session.attendees, Session.class_group, Session.class_group_id):
+    _reset_cache_on_change(_attribute, "_attendee_ids", "_attendee_names")
+_reset_cache_on_change(Session.subgroup_label, "normalised_subgroup_label")
+_reset_cache_on_expire(ClassGroup, "sort_key", "_unavailable_set", "_session_timeline")
+_reset_cache_on_change(ClassGroup.sessions, "_session_timeline")
+_reset_cache_on_change(ClassGroup.attending_sessions, "_session_timeline")
+_reset_cache_on_change(ClassGroup.name, "sort_key")
+_reset_cache_on_change(ClassGroup.unavailable_dates, "_unavailable_set")
+
+
+def _forget_session_timelines(target: Session, *args, **kwargs) -> None:
+    """Drop group, teacher and room timelines that may hold a rescheduled session."""
+
+    state = inspect(target)
+    if state.transient or state.detached:
+        return
+    if state.persistent:
+        # The owners may not be loaded on the session itself.
+        candidates = state.session.identity_map.values()
+    else:
+        candidates = [
+            target.__dict__.get("class_group"),
+            target.__dict__.get("teacher"),
+            target.__dict__.get("room"),
+            *target.__dict__.get("attendees", ()),
+        ]
+    for candidate in candidates:
+        if isinstance(candidate, (ClassGroup, Teacher, Room)):
+            _drop_cached(candidate, ("_session_timeline",))
+
+
+for _attribute in (Session.start_time, Session.end_time):
+    event.listen(_attribute, "set", _forget_session_timelines)
+
+
+def _forget_attendee_names(target: ClassGroup, *args, **kwargs) -> None:
+    """Drop memoised attendee names that may spell a renamed class group."""
+
+    state = inspect(target)
+    if state.transient or state.detached:
+        return
+    if state.persistent:
+        candidates = state.session.identity_map.values()
+    else:
+        candidates = chain(
+            target.__dict__.get("sessions", ()),
+            target.__dict__.get("attending_sessions", ()),
+        )
+    for candidate in candidates:
+        if isinstance(candidate, Session):
+            _drop_cached(candidate, ("_attendee_names",))
+
+
+event.listen(ClassGroup.name, "set", _forget_attendee_names)
+
+
+def _forget_software_names(target: Software, *args, **kwargs) -> None:
+    """Drop memoised software names that may spell a renamed software."""
+
+    state = inspect(target)
+    if state.transient or state.detached:
+        return
+    if state.persistent:
+        candidates = state.session.identity_map.values()
+    else:
+        candidates = chain(
+            target.__dict__.get("courses", ()), target.__dict__.get("rooms", ())
+        )
+    for candidate in candidates:
+        if isinstance(candidate, (Course, Room)):
+            _drop_cached(candidate, ("_software_names",))
+
+
+event.listen(Software.name, "set", _forget_software_names)
+
+
+def _forget_preferred_teachers(target: Course, *args, **kwargs) -> None:
+    """Drop link teacher preferences that depend on the course type."""
+
+    state = inspect(target)
+    if state.persistent:
+        # Links may be loaded without the course's collection.
+        candidates = state.session.identity_map.values()
+    else:
+        candidates = target.__dict__.get("class_links", ())
+    for candidate in candidates:
+        if isinstance(candidate, CourseClassLink) and candidate.__dict__.get("course") is target:
+            _drop_cached(candidate, ("_preferred_by_label",))
+
+
+event.listen(Course.course_type, "set", _forget_preferred_teachers)
+
+
+def _forget_closed_ranges(*args, **kwargs) -> None:
+    if has_app_context():
+        g.pop(_CLOSED_RANGES_KEY, None)
+
+
+def _forget_closed_ranges_on_bulk_write(orm_execute_state) -> None:
+    if not (orm_execute_state.is_delete or orm_execute_state.is_update):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is ClosingPeriod:
+        _forget_closed_ranges()
+
+
+for _identifier in ("after_insert", "after_update", "after_delete"):
+    event.listen(ClosingPeriod, _identifier, _forget_closed_ranges)
+event.listen(OrmSession, "do_orm_execute", _forget_closed_ranges_on_bulk_write)
+event.listen(OrmSession, "after_rollback", _forget_closed_ranges)
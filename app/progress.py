@@ -3,8 +3,9 @@ from __future__ import annotations
 import threading
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict
+from typing import Callable, Deque, Dict, Tuple
 
 
 class ScheduleProgress:
@@ -33,7 +34,7 @@ class NullScheduleProgress(ScheduleProgress):
         return
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgressSnapshot:
     job_id: str
     label: str
@@ -65,6 +66,8 @@ class ScheduleProgressTracker(ScheduleProgress):
         self._started_at: float | None = None
         self._finished_at: float | None = None
         self._current_label: str | None = None
+        self._on_finished: Callable[[str, float], None] | None = None
+        self._publish_locked()
 
     # Public helpers -------------------------------------------------
     def initialise(self, total_hours: float) -> None:
@@ -77,6 +80,7 @@ class ScheduleProgressTracker(ScheduleProgress):
             if self._started_at is None:
                 self._started_at = now
             self._finished_at = None
+            self._publish_locked()
 
     def record(self, hours: float, sessions: int = 0) -> None:
         if hours <= 0 and sessions <= 0:
@@ -92,6 +96,7 @@ class ScheduleProgressTracker(ScheduleProgress):
                 self._state = "running"
             if self._started_at is None:
                 self._started_at = time.monotonic()
+            self._publish_locked()
 
     def complete(self, message: str | None = None) -> None:
         with self._lock:
@@ -100,8 +105,10 @@ class ScheduleProgressTracker(ScheduleProgress):
             self._message = message.strip() if message else self._message
             if self._started_at is None:
                 self._started_at = time.monotonic()
-            self._finished_at = time.monotonic()
+            self._finished_at = finished_at = time.monotonic()
             self._current_label = None
+            self._publish_locked()
+        self._notify_finished(finished_at)
 
     def fail(self, message: str) -> None:
         with self._lock:
@@ -109,60 +116,90 @@ class ScheduleProgressTracker(ScheduleProgress):
             self._message = message.strip() if message else None
             if self._started_at is None:
                 self._started_at = time.monotonic()
-            self._finished_at = time.monotonic()
+            self._finished_at = finished_at = time.monotonic()
             self._current_label = None
+            self._publish_locked()
+        self._notify_finished(finished_at)
 
     # Snapshot -------------------------------------------------------
     def snapshot(self) -> ProgressSnapshot:
-        with self._lock:
-            percent = self._percent_locked()
-            eta = self._eta_locked()
-            finished = self._state in self.SUCCESS_STATES
-            message = self._message
-            return ProgressSnapshot(
-                job_id=self.job_id,
-                label=self.label,
-                state=self._state,
-                percent=percent,
-                eta_seconds=eta,
-                sessions_created=self._sessions_created,
-                completed_hours=self._completed_hours,
-                total_hours=self._total_hours,
-                message=message,
-                finished=finished,
-                current_label=self._current_label,
-            )
+        # Writers swap in a fresh immutable tuple under the lock; reading the
+        # reference is atomic, so polling never waits on the scheduler.
+        (
+            state,
+            total_hours,
+            completed_hours,
+            sessions_created,
+            started_at,
+            message,
+            current_label,
+            percent,
+        ) = self._published
+        return ProgressSnapshot(
+            job_id=self.job_id,
+            label=self.label,
+            state=state,
+            percent=percent,
+            eta_seconds=self._eta(state, total_hours, completed_hours, started_at),
+            sessions_created=sessions_created,
+            completed_hours=completed_hours,
+            total_hours=total_hours,
+            message=message,
+            finished=state in self.SUCCESS_STATES,
+            current_label=current_label,
+        )
 
     def is_finished(self) -> bool:
-        with self._lock:
-            return self._state in self.SUCCESS_STATES
+        return self._published[0] in self.SUCCESS_STATES
 
     def age(self) -> float:
         reference = self._finished_at or self._started_at or time.monotonic()
         return time.monotonic() - reference
 
     # Internal helpers -----------------------------------------------
-    def _percent_locked(self) -> int:
-        if self._total_hours <= 0:
-            return 100 if self._state == "success" else 0
-        ratio = self._completed_hours / self._total_hours
-        if self._state == "success":
+    def _publish_locked(self) -> None:
+        # The percentage only changes with these fields, so it is computed
+        # once per update; the ETA depends on the clock and stays per read.
+        self._published = (
+            self._state,
+            self._total_hours,
+            self._completed_hours,
+            self._sessions_created,
+            self._started_at,
+            self._message,
+            self._current_label,
+            self._percent(self._state, self._total_hours, self._completed_hours),
+        )
+
+    def _notify_finished(self, finished_at: float) -> None:
+        # Called outside the tracker lock so the registry never waits on it.
+        if self._on_finished is not None:
+            self._on_finished(self.job_id, finished_at)
+
+    @staticmethod
+    def _percent(state: str, total_hours: float, completed_hours: float) -> int:
+        if total_hours <= 0:
+            return 100 if state == "success" else 0
+        ratio = completed_hours / total_hours
+        if state == "success":
             ratio = 1.0
         return max(0, min(int(round(ratio * 100)), 100))
 
-    def _eta_locked(self) -> float | None:
-        if (
-            self._state != "running"
-            or self._total_hours <= 0
-            or self._completed_hours <= 0
-        ):
+    @staticmethod
+    def _eta(
+        state: str,
+        total_hours: float,
+        completed_hours: float,
+        started_at: float | None,
+    ) -> float | None:
+        if state != "running" or total_hours <= 0 or completed_hours <= 0:
             return None
-        if self._completed_hours >= self._total_hours:
+        if completed_hours >= total_hours:
             return 0.0
-        if self._started_at is None:
+        if started_at is None:
             return None
-        elapsed = time.monotonic() - self._started_at
-        ratio = self._completed_hours / self._total_hours
+        elapsed = time.monotonic() - started_at
+        ratio = completed_hours / total_hours
         if ratio <= 0:
             return None
         remaining_ratio = max(1.0 / ratio - 1.0, 0.0)
@@ -180,6 +217,7 @@ class ScheduleProgressTracker(ScheduleProgress):
                 self._state = "running"
                 if self._started_at is None:
                     self._started_at = time.monotonic()
+            self._publish_locked()
 
     def create_slice(self, label: str | None = None) -> "ScheduleProgressSlice":
         return ScheduleProgressSlice(self, label=label)
@@ -207,11 +245,17 @@ class ProgressRegistry:
 
     def __init__(self) -> None:
         self._trackers: Dict[str, ScheduleProgressTracker] = {}
+        # ``(finished_at, job_id)`` in completion order, so ``purge`` only
+        # visits trackers old enough to drop.
+        self._finished: Deque[Tuple[float, str]] = deque()
         self._lock = threading.Lock()
 
     def register(self, tracker: ScheduleProgressTracker) -> None:
+        tracker._on_finished = self._mark_finished
         with self._lock:
             self._trackers[tracker.job_id] = tracker
+        if tracker._finished_at is not None:
+            self._mark_finished(tracker.job_id, tracker._finished_at)
 
     def create(self, label: str) -> ScheduleProgressTracker:
         tracker = ScheduleProgressTracker(label)
@@ -219,22 +263,28 @@ class ProgressRegistry:
         return tracker
 
     def get(self, job_id: str) -> ScheduleProgressTracker | None:
-        with self._lock:
-            return self._trackers.get(job_id)
+        # A single dict lookup is atomic, so polling readers skip the lock
+        # that serialises registrations and purges.
+        return self._trackers.get(job_id)
 
     def remove(self, job_id: str) -> None:
         with self._lock:
             self._trackers.pop(job_id, None)
 
     def purge(self, max_age_seconds: float = 600.0) -> None:
+        cutoff = time.monotonic() - max_age_seconds
+        with self._lock:
+            finished = self._finished
+            while finished and finished[0][0] < cutoff:
+                finished_at, job_id = finished.popleft()
+                tracker = self._trackers.get(job_id)
+                # A tracker finished again later has a newer entry queued.
+                if tracker is not None and tracker._finished_at == finished_at:
+                    del self._trackers[job_id]
+
+    def _mark_finished(self, job_id: str, finished_at: float) -> None:
         with self._lock:
-            stale_ids = [
-                job_id
-                for job_id, tracker in self._trackers.items()
-                if tracker.is_finished() and tracker.age() > max_age_seconds
-            ]
-            for job_id in stale_ids:
-                self._trackers.pop(job_id, None)
+            self._finished.append((finished_at, job_id))
 
 
 progress_registry = ProgressRegistry()
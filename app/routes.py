@@ -5,6 +5,7 @@ import math
 import threading
 from collections import OrderedDict
 from datetime import date, datetime, time, timedelta, timezone
+from operator import attrgetter
 from typing import Iterable, List, MutableSequence
 
 from flask import (
@@ -17,9 +18,9 @@ from flask import (
     request,
     url_for,
 )
-from sqlalchemy import case, func, or_
+from sqlalchemy import case, delete, func, inspect, or_, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 
 from . import db
 from .events import sessions_to_grouped_events
@@ -52,10 +53,10 @@ from .scheduler import (
     format_class_label,
     generate_schedule,
     has_weekly_course_conflict,
-    overlaps,
     respects_weekly_chronology,
 )
 from .utils import (
+    dumps_json,
     parse_unavailability_ranges,
     ranges_as_payload,
     serialise_unavailability_ranges,
@@ -151,14 +152,22 @@ def _parse_non_negative_int(raw_value: str | None, default: int = 0) -> int:
 
 
 def _clear_course_schedule(course: Course) -> tuple[int, int]:
-    removed_sessions = len(course.sessions)
-    for session in list(course.sessions):
-        db.session.delete(session)
-
-    removed_logs = len(course.generation_logs)
-    for log in list(course.generation_logs):
-        db.session.delete(log)
-
+    return _clear_courses_schedule([course.id])
+
+
+def _clear_courses_schedule(course_ids: Iterable[int]) -> tuple[int, int]:
+    # Attendance rows follow their sessions through ON DELETE CASCADE, so
+    # neither collection has to be loaded just to be deleted row by row, and
+    # a single statement per table covers every course at once.
+    course_ids = list(course_ids)
+    if not course_ids:
+        return 0, 0
+    removed_sessions = db.session.execute(
+        delete(Session).where(Session.course_id.in_(course_ids))
+    ).rowcount
+    removed_logs = db.session.execute(
+        delete(CourseScheduleLog).where(CourseScheduleLog.course_id.in_(course_ids))
+    ).rowcount
     return removed_sessions, removed_logs
 
 
@@ -252,6 +261,7 @@ def _effective_generation_status(
     latest_log: CourseScheduleLog | None,
     *,
     remaining_hours: float | None = None,
+    scheduled_hours: float | None = None,
 ) -> str:
     if latest_log is None:
         return "none"
@@ -259,9 +269,11 @@ def _effective_generation_status(
     if status not in {"warning", "error"}:
         return status
 
-    required_total = float(course.total_required_hours or 0)
-    scheduled_total = float(course.scheduled_hours or 0)
+    if scheduled_hours is None:
+        scheduled_hours = course.scheduled_hours
+    scheduled_total = float(scheduled_hours or 0)
     if remaining_hours is None:
+        required_total = float(course.total_required_hours or 0)
         remaining_hours = max(required_total - scheduled_total, 0.0)
 
     if scheduled_total > 0 and math.isclose(remaining_hours, 0.0, abs_tol=1e-6):
@@ -631,10 +643,7 @@ def _parse_time_only(value: str | None) -> time | None:
 def _teacher_unavailability_backgrounds(teacher: Teacher) -> list[dict[str, object]]:
     backgrounds: list[dict[str, object]] = []
     for weekday in range(5):
-        day_slots = sorted(
-            (slot for slot in teacher.availabilities if slot.weekday == weekday),
-            key=lambda slot: slot.start_time,
-        )
+        day_slots = teacher.slots_by_weekday.get(weekday, ())
         pointer = WORKDAY_START
         if not day_slots:
             backgrounds.append(
@@ -678,7 +687,7 @@ def _teacher_unavailability_backgrounds(teacher: Teacher) -> list[dict[str, obje
                 }
             )
 
-    for start_day, end_day in parse_unavailability_ranges(teacher.unavailable_dates):
+    for start_day, end_day in teacher.unavailable_ranges:
         backgrounds.append(
             {
                 "start": start_day.strftime("%Y-%m-%dT00:00:00"),
@@ -736,19 +745,26 @@ def _parse_class_group_choice(raw_value: str | None) -> tuple[int, str | None] |
     return class_id, (label or None)
 
 
-def _has_conflict(
-    sessions: list[Session],
+def _has_booking_conflict(
+    owner: Teacher | Room,
+    owner_column,
     start: datetime,
     end: datetime,
     *,
     ignore_session_id: int | None = None,
 ) -> bool:
-    for session in sessions:
-        if ignore_session_id and session.id == ignore_session_id:
-            continue
-        if overlaps(session.start_time, session.end_time, start, end):
-            return True
-    return False
+    """Check ``owner``'s sessions for an overlap without loading them all."""
+
+    if owner.id is None or "sessions" in inspect(owner).dict:
+        return owner.has_session_during(start, end, ignore_session_id=ignore_session_id)
+    query = select(Session.id).where(
+        owner_column == owner.id,
+        Session.start_time < end,
+        Session.end_time > start,
+    )
+    if ignore_session_id:
+        query = query.where(Session.id != ignore_session_id)
+    return db.session.scalar(query.limit(1)) is not None
 
 
 def _validate_session_constraints(
@@ -770,9 +786,13 @@ def _validate_session_constraints(
         return "Le créneau choisi dépasse les fenêtres horaires autorisées."
     if not teacher.is_available_during(start_dt, end_dt):
         return "L'enseignant n'est pas disponible sur ce créneau."
-    if _has_conflict(teacher.sessions, start_dt, end_dt, ignore_session_id=ignore_session_id):
+    if _has_booking_conflict(
+        teacher, Session.teacher_id, start_dt, end_dt, ignore_session_id=ignore_session_id
+    ):
         return "L'enseignant a déjà une séance sur ce créneau."
-    if _has_conflict(room.sessions, start_dt, end_dt, ignore_session_id=ignore_session_id):
+    if _has_booking_conflict(
+        room, Session.room_id, start_dt, end_dt, ignore_session_id=ignore_session_id
+    ):
         return "La salle est déjà réservée sur ce créneau."
     for class_group in class_groups:
         subgroup_label: str | None = None
@@ -854,7 +874,7 @@ def dashboard():
     global_search_index: list[dict[str, str]] = []
     for course in courses:
         options: list[dict[str, str]] = []
-        links = sorted(course.class_links, key=lambda link: link.class_group.name.lower())
+        links = sorted(course.class_links, key=attrgetter("class_group.sort_key"))
         has_subgroups = False
         course_types[course.id] = course.course_type
         if course.is_cm:
@@ -1105,13 +1125,9 @@ def dashboard():
                 flash("Aucune séance n'était planifiée pour ce cours.", "info")
             return redirect(url_for("main.dashboard"))
         elif request.form.get("form") == "clear-all-sessions":
-            total_removed_sessions = 0
-            total_removed_logs = 0
-            for course in courses:
-                removed_sessions, removed_logs = _clear_course_schedule(course)
-                total_removed_sessions += removed_sessions
-                total_removed_logs += removed_logs
-
+            total_removed_sessions, total_removed_logs = _clear_courses_schedule(
+                course.id for course in courses
+            )
             db.session.commit()
 
             if total_removed_sessions or total_removed_logs:
@@ -1137,19 +1153,20 @@ def dashboard():
 
             return redirect(url_for("main.dashboard"))
 
-    all_sessions = Session.query.all()
+    all_sessions = Session.hydrated_query().all()
     events = sessions_to_grouped_events(all_sessions)
     has_any_scheduled_sessions = len(all_sessions) > 0
     course_summaries: list[dict[str, object]] = []
+    hours_map = Course.hours_map(course.id for course in courses)
     for course in courses:
-        required_total = course.total_required_hours
-        scheduled_total = course.scheduled_hours
+        required_total, scheduled_total = hours_map[course.id]
         remaining = max(required_total - scheduled_total, 0)
         latest_log = course.latest_generation_log
         display_status = _effective_generation_status(
             course,
             latest_log,
             remaining_hours=remaining,
+            scheduled_hours=scheduled_total,
         )
         course_summaries.append(
             {
@@ -1176,7 +1193,7 @@ def dashboard():
         course_subgroup_hints=course_subgroup_hints,
         course_types_json=json.dumps(course_types, ensure_ascii=False),
         course_summaries=course_summaries,
-        events_json=json.dumps(events, ensure_ascii=False),
+        events_json=dumps_json(events),
         start_times=START_TIMES,
         course_type_labels=COURSE_TYPE_LABELS,
         global_search_index_json=json.dumps(global_search_index, ensure_ascii=False),
@@ -1187,7 +1204,11 @@ def dashboard():
 
 @bp.route("/config", methods=["GET", "POST"])
 def configuration():
-    course_names = CourseName.query.order_by(CourseName.name).all()
+    course_names = (
+        CourseName.query.options(undefer(CourseName.usage_count))
+        .order_by(CourseName.name)
+        .all()
+    )
     equipments = Equipment.query.order_by(Equipment.name).all()
     softwares = Software.query.order_by(Software.name).all()
     rooms = Room.query.order_by(Room.name).all()
@@ -1313,17 +1334,14 @@ def teacher_detail(teacher_id: int):
     assignable_courses = [course for course in courses if teacher not in course.teachers]
 
     allocation_summary: list[dict[str, object]] = []
+    hours_by_course = teacher.scheduled_hours_by_course()
     for course in teacher.courses:
         target_hours = 0
         for allocation in course.teacher_allocations:
             if allocation.teacher_id == teacher.id:
                 target_hours = allocation.target_hours or 0
                 break
-        scheduled_hours = sum(
-            session.duration_hours
-            for session in course.sessions
-            if session.teacher_id == teacher.id
-        )
+        scheduled_hours = hours_by_course.get(course.id, 0)
         allocation_summary.append(
             {
                 "course": course,
@@ -1417,7 +1435,9 @@ def teacher_detail(teacher_id: int):
             flash("Disponibilités mises à jour", "success")
         return redirect(url_for("main.teacher_detail", teacher_id=teacher_id))
 
-    events = sessions_to_grouped_events(teacher.sessions)
+    events = sessions_to_grouped_events(
+        Session.hydrated_query().filter(Session.teacher_id == teacher.id).all()
+    )
     selected_slots: set[str] = set()
     for availability in teacher.availabilities:
         if availability.weekday >= 5:
@@ -1440,13 +1460,11 @@ def teacher_detail(teacher_id: int):
         courses=courses,
         assignable_courses=assignable_courses,
         allocation_summary=allocation_summary,
-        events_json=json.dumps(events, ensure_ascii=False),
+        events_json=dumps_json(events),
         availability_slots=SCHEDULE_SLOT_CHOICES,
         selected_availability_slots=selected_slots,
         unavailability_backgrounds_json=json.dumps(backgrounds, ensure_ascii=False),
-        unavailability_ranges=ranges_as_payload(
-            parse_unavailability_ranges(teacher.unavailable_dates)
-        ),
+        unavailability_ranges=ranges_as_payload(teacher.unavailable_ranges),
     )
 
 
@@ -1825,7 +1843,17 @@ def class_detail(class_id: int):
                 flash("Étudiant retiré de la classe", "success")
         return redirect(url_for("main.class_detail", class_id=class_id))
 
-    events = sessions_to_grouped_events(class_group.all_sessions)
+    class_sessions = (
+        Session.hydrated_query()
+        .filter(
+            or_(
+                Session.class_group_id == class_group.id,
+                Session.attendees.any(ClassGroup.id == class_group.id),
+            )
+        )
+        .all()
+    )
+    events = sessions_to_grouped_events(class_sessions)
     unavailability_backgrounds = _class_unavailability_backgrounds(class_group)
     return render_template(
         "classes/detail.html",
@@ -1833,7 +1861,7 @@ def class_detail(class_id: int):
         courses=courses,
         assignable_courses=assignable_courses,
         teachers=teachers,
-        events_json=json.dumps(events, ensure_ascii=False),
+        events_json=dumps_json(events),
         unavailability_backgrounds_json=json.dumps(unavailability_backgrounds, ensure_ascii=False),
     )
 
@@ -1915,13 +1943,15 @@ def room_detail(room_id: int):
                 flash("Nom de salle déjà utilisé", "danger")
         return redirect(url_for("main.room_detail", room_id=room_id))
 
-    events = sessions_to_grouped_events(room.sessions)
+    events = sessions_to_grouped_events(
+        Session.hydrated_query().filter(Session.room_id == room.id).all()
+    )
     return render_template(
         "rooms/detail.html",
         room=room,
         equipments=equipments,
         softwares=softwares,
-        events_json=json.dumps(events, ensure_ascii=False),
+        events_json=dumps_json(events),
         start_times=START_TIMES,
     )
 
@@ -1999,6 +2029,7 @@ def courses_list():
     return render_template(
         "courses/list.html",
         courses=courses,
+        hours_map=Course.hours_map(course.id for course in courses),
         equipments=equipments,
         softwares=softwares,
         class_groups=class_groups,
@@ -2074,13 +2105,9 @@ def generation_overview():
                     "warning",
                 )
         elif action == "clear":
-            courses = _load_courses_for_generation()
-            total_sessions = 0
-            total_logs = 0
-            for course in courses:
-                removed_sessions, removed_logs = _clear_course_schedule(course)
-                total_sessions += removed_sessions
-                total_logs += removed_logs
+            total_sessions, total_logs = _clear_courses_schedule(
+                db.session.scalars(select(Course.id))
+            )
             db.session.commit()
             if total_sessions:
                 flash(
@@ -2111,12 +2138,17 @@ def generation_overview():
     courses = (
         Course.query.options(
             selectinload(Course.class_links).selectinload(CourseClassLink.class_group),
-            selectinload(Course.sessions),
             selectinload(Course.generation_logs),
         )
         .order_by(COURSE_TYPE_ORDER_EXPRESSION, Course.name.asc())
         .all()
     )
+    hours_map = Course.hours_map(course.id for course in courses)
+    session_counts = dict(
+        db.session.execute(
+            select(Session.course_id, func.count(Session.id)).group_by(Session.course_id)
+        ).all()
+    )
 
     def _unique(values: Iterable[str | None]) -> list[str]:
         collected: list[str] = []
@@ -2132,14 +2164,15 @@ def generation_overview():
     global_remaining_hours = 0
     for course in courses:
         latest_log = course.latest_generation_log
-        required_hours = course.total_required_hours
-        scheduled_hours = course.scheduled_hours
+        required_hours, scheduled_hours = hours_map[course.id]
+        sessions_count = session_counts.get(course.id, 0)
         remaining_hours = max(required_hours - scheduled_hours, 0)
         global_remaining_hours += remaining_hours
         status = _effective_generation_status(
             course,
             latest_log,
             remaining_hours=remaining_hours,
+            scheduled_hours=scheduled_hours,
         )
         errors: list[str] = []
         suggestions: list[str] = []
@@ -2163,7 +2196,7 @@ def generation_overview():
                 "latest_log": latest_log,
                 "errors": _unique(errors),
                 "suggestions": _unique(suggestions),
-                "sessions_count": len(course.sessions),
+                "sessions_count": sessions_count,
                 "scheduled_hours": scheduled_hours,
                 "required_hours": required_hours,
                 "remaining_hours": remaining_hours,
@@ -2590,7 +2623,9 @@ def course_detail(course_id: int):
                 flash("Aucune séance n'était planifiée pour ce cours.", "info")
         return redirect(url_for("main.course_detail", course_id=course_id))
 
-    events = sessions_to_grouped_events(course.sessions)
+    events = sessions_to_grouped_events(
+        Session.hydrated_query().filter(Session.course_id == course.id).all()
+    )
     latest_generation_log = (
         CourseScheduleLog.query.filter_by(course_id=course.id)
         .order_by(CourseScheduleLog.created_at.desc())
@@ -2671,7 +2706,7 @@ def course_detail(course_id: int):
         available_teachers=available_teachers,
         course_sessions=course_sessions,
         teacher_hours_map=teacher_hours_map,
-        events_json=json.dumps(events, ensure_ascii=False),
+        events_json=dumps_json(events),
         start_times=START_TIMES,
         latest_generation_log=latest_generation_log,
         status_labels=GENERATION_STATUS_LABELS,
@@ -2745,7 +2780,9 @@ def move_session(session_id: int):
     session.start_time = start_dt
     session.end_time = end_dt
     db.session.commit()
-    return {"event": session.as_event()}
+    return current_app.response_class(
+        dumps_json({"event": session.as_event()}), mimetype="application/json"
+    )
 
 
 @bp.route("/sessions/<int:session_id>", methods=["DELETE"])
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 import logging
 from collections import Counter, defaultdict
 from datetime import date, datetime, time, timedelta
+from operator import attrgetter
 from typing import Iterable, List, Optional, Set
 
 from flask import current_app
@@ -287,7 +287,7 @@ class ScheduleReporter:
             course=self.course,
             status=self.status,
             summary=self.summary,
-            messages=json.dumps(self._serialise_entries(), ensure_ascii=False),
+            messages=self._serialise_entries(),
             window_start=self.window_start,
             window_end=self.window_end,
         )
@@ -458,12 +458,7 @@ def find_available_room(
         room_software_ids = {software.id for software in room.softwares}
         missing_softwares = required_software_ids.difference(room_software_ids)
 
-        conflict = False
-        for session in room.sessions:
-            if overlaps(session.start_time, session.end_time, start, end):
-                conflict = True
-                break
-        if conflict:
+        if room.has_session_during(start, end):
             continue
 
         missing_count = len(missing_softwares)
@@ -1154,8 +1149,7 @@ def find_available_teacher(
         ):
             continue
         if any(
-            overlaps(s.start_time, s.end_time, segment_start, segment_end)
-            for s in teacher.sessions
+            teacher.has_session_during(segment_start, segment_end)
             for segment_start, segment_end in segments_to_check
         ):
             continue
@@ -1766,10 +1760,7 @@ def _try_split_block(
         rooms: list[Room] = []
         valid = True
         for seg_start, seg_end in segment_datetimes:
-            if any(
-                overlaps(existing.start_time, existing.end_time, seg_start, seg_end)
-                for existing in teacher.sessions
-            ):
+            if teacher.has_session_during(seg_start, seg_end):
                 if diagnostics is not None:
                     diagnostics.add_teacher(
                         f"{teacher.name} est déjà planifié sur {seg_start.strftime('%d/%m %H:%M')}"
@@ -2084,10 +2075,7 @@ def _cm_try_split_block(
         rooms: list[Room] = []
         valid = True
         for seg_start, seg_end in segment_datetimes:
-            if any(
-                overlaps(existing.start_time, existing.end_time, seg_start, seg_end)
-                for existing in teacher.sessions
-            ):
+            if teacher.has_session_during(seg_start, seg_end):
                 if diagnostics is not None:
                     diagnostics.add_teacher(
                         f"{teacher.name} est déjà planifié sur {seg_start.strftime('%d/%m %H:%M')}"
@@ -2386,7 +2374,7 @@ def generate_schedule(
         created_sessions = []
         slot_length_hours = max(int(course.session_length_hours), 1)
 
-        links = sorted(course.class_links, key=lambda link: link.class_group.name.lower())
+        links = sorted(course.class_links, key=attrgetter("class_group.sort_key"))
         if links:
             reporter.info(
                 "Classes associées : "
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import json
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import Iterable, List, Tuple
 
+try:  # pragma: no cover - exercised only when orjson is installed
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -32,7 +37,7 @@ def parse_unavailability_ranges(raw: str | None) -> List[Tuple[date, date]]:
     ranges: list[tuple[date, date]] = []
 
     try:
-        payload = json.loads(raw)
+        payload = loads_json(raw)
     except (TypeError, ValueError):
         payload = None
 
@@ -72,6 +77,32 @@ def parse_unavailability_ranges(raw: str | None) -> List[Tuple[date, date]]:
     return merged
 
 
+def _json_default(value: object) -> str:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(payload: object) -> str:
+    """Serialise ``payload`` for embedding in pages, emitting ISO 8601 dates.
+
+    Calendar events keep their ``datetime`` values until this point so the
+    encoder formats them; ``orjson`` is used when it is installed.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, default=_json_default)
+
+
+def loads_json(raw: str | bytes) -> object:
+    """Parse JSON text with ``orjson`` when available, raising ``ValueError``."""
+
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def serialise_unavailability_ranges(ranges: Iterable[tuple[date, date]]) -> str | None:
     normalised: list[dict[str, str]] = []
     for start, end in ranges:
@@ -26,6 +26,18 @@ class Config:
 
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", _default_uri)
 
+    # The scheduler emits many identically shaped queries; a larger compiled
+    # statement cache lets SQLAlchemy skip recompiling them.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "query_cache_size": int(os.environ.get("DATABASE_QUERY_CACHE_SIZE", "1200")),
+    }
+
+    # When enabled, calendar queries refuse any relationship they did not
+    # eager-load explicitly, so a forgotten loader fails loudly instead of
+    # silently issuing one query per session.
+    RAISELOAD_STRICT = os.environ.get("RAISELOAD_STRICT", "").lower() in {"1", "true", "yes"}
+
 class TestConfig(Config):
     TESTING = True
+    RAISELOAD_STRICT = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
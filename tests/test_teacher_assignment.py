@@ -1,3 +1,4 @@
+import json
 import unittest
 from collections import Counter
 from datetime import date, datetime, time, timedelta
@@ -10,7 +11,9 @@ from app import (create_app, db, _realign_tp_session_teachers,
 from config import TestConfig
 from app.models import (
     ClassGroup,
+    ClosingPeriod,
     Course,
+    CourseAllowedWeek,
     CourseClassLink,
     CourseName,
     CourseScheduleLog,
@@ -18,13 +21,16 @@ from app.models import (
     Equipment,
     Room,
     Session,
+    Software,
     Teacher,
     TeacherAvailability,
     best_teacher_duos,
     recommend_teacher_duos_for_classes,
 )
-from sqlalchemy import text
-from app.routes import _validate_session_constraints
+from sqlalchemy import select, text
+from app.progress import ProgressRegistry, ScheduleProgressTracker
+from app.routes import _has_booking_conflict, _validate_session_constraints
+from app.utils import dumps_json
 from app.scheduler import (
     ScheduleReporter,
     generate_schedule,
@@ -187,6 +193,186 @@ class TeacherAssignmentTestCase(DatabaseTestCase):
         teachers = event["extendedProps"]["teachers"]
         self.assertEqual([entry["id"] for entry in teachers], [teacher_b.id])
         self.assertEqual(event["extendedProps"]["teacher"], teacher_b.name)
+        payload = json.loads(dumps_json(event))
+        self.assertEqual(payload["start"], start.isoformat())
+        self.assertEqual(payload["extendedProps"]["segments"][0]["end"], end.isoformat())
+
+        # TestConfig enables RAISELOAD_STRICT: any lazy load ``as_event``
+        # needs beyond the declared loaders raises here.
+        db.session.expunge_all()
+        hydrated = db.session.scalars(Session.with_event_loads(db.select(Session))).one()
+        self.assertEqual(hydrated.as_event(), event)
+
+    def test_session_event_software_lists_follow_changes(self) -> None:
+        course, _, class_group = self._create_tp_course()
+        python = Software(name="Python")
+        matlab = Software(name="Matlab")
+        room = Room(name="B203", capacity=24, softwares=[python])
+        course.softwares = [python, matlab]
+        session = Session(
+            course=course,
+            teacher=Teacher(name="Alice"),
+            room=room,
+            class_group=class_group,
+            start_time=datetime(2024, 1, 10, 8, 0, 0),
+            end_time=datetime(2024, 1, 10, 10, 0, 0),
+        )
+        db.session.add(session)
+        db.session.commit()
+
+        props = session.as_event()["extendedProps"]
+        self.assertEqual(props["course_softwares"], ["Matlab", "Python"])
+        self.assertEqual(props["missing_softwares"], ["Matlab"])
+
+        room.softwares.append(matlab)
+        python.name = "Anaconda"
+        props = session.as_event()["extendedProps"]
+        self.assertEqual(props["course_softwares"], ["Anaconda", "Matlab"])
+        self.assertEqual(props["room_softwares"], ["Anaconda", "Matlab"])
+        self.assertEqual(props["missing_softwares"], [])
+
+    def test_link_preferred_teachers_follow_assignment_changes(self) -> None:
+        course, link, _ = self._create_tp_course()
+        teacher_a = Teacher(name="Alice")
+        teacher_b = Teacher(name="Bruno")
+        db.session.add_all([teacher_a, teacher_b])
+        link.teacher_a = teacher_a
+        db.session.commit()
+        self.assertEqual(link.preferred_teachers("b"), [teacher_a])
+        self.assertEqual(link.preferred_teachers(None), [teacher_a])
+
+        link.teacher_b = teacher_b
+        self.assertEqual(link.preferred_teachers(" b "), [teacher_b])
+        self.assertEqual(link.preferred_teachers("C"), [teacher_a, teacher_b])
+        self.assertEqual(link.assigned_teachers(), [teacher_a, teacher_b])
+
+        course.course_type = "SAE"
+        self.assertEqual(link.preferred_teachers("A"), [teacher_a, teacher_b])
+        link.group_count = 1
+        course.course_type = "TD"
+        self.assertEqual(link.preferred_teachers("B"), [teacher_a])
+        db.session.commit()
+        self.assertEqual(link.teacher_for_label("B"), teacher_a)
+
+    def test_session_attendees_follow_membership_and_renames(self) -> None:
+        course, _, class_group = self._create_tp_course()
+        other_group = ClassGroup(name="A2")
+        teacher = Teacher(name="Alice")
+        room = Room(name="B202", capacity=24)
+        session = Session(
+            course=course,
+            teacher=teacher,
+            room=room,
+            class_group=class_group,
+            start_time=datetime(2024, 1, 10, 8, 0),
+            end_time=datetime(2024, 1, 10, 10, 0),
+        )
+        db.session.add_all([other_group, teacher, room, session])
+        db.session.commit()
+        self.assertEqual(session.attendee_ids(), {class_group.id})
+        self.assertEqual(session.attendee_names(), [class_group.name])
+
+        session.attendees.append(other_group)
+        self.assertEqual(session.attendee_ids(), {other_group.id})
+        session.attendees.append(class_group)
+        self.assertEqual(session.attendee_ids(), {class_group.id, other_group.id})
+        self.assertEqual(session.attendee_names(), ["A2", class_group.name])
+
+        other_group.name = "Z2"
+        self.assertEqual(session.attendee_names(), [class_group.name, "Z2"])
+        db.session.commit()
+        self.assertEqual(session.attendee_names(), [class_group.name, "Z2"])
+
+    def test_teacher_availability_follows_slot_and_date_changes(self) -> None:
+        teacher = Teacher(name="Alice")
+        db.session.add(teacher)
+        db.session.commit()
+        monday = date(2024, 1, 8)
+        self.assertFalse(teacher.is_available_on(monday))
+
+        db.session.add(
+            TeacherAvailability(
+                teacher=teacher,
+                weekday=0,
+                start_time=time(8, 0),
+                end_time=time(12, 0),
+            )
+        )
+        db.session.commit()
+        self.assertTrue(teacher.is_available_on(monday))
+        self.assertTrue(
+            teacher.is_available_during(
+                datetime(2024, 1, 8, 8, 0), datetime(2024, 1, 8, 10, 0)
+            )
+        )
+        self.assertFalse(
+            teacher.is_available_during(
+                datetime(2024, 1, 8, 10, 0), datetime(2024, 1, 8, 8, 0)
+            )
+        )
+
+        teacher.availabilities[0].end_time = time(9, 0)
+        self.assertFalse(
+            teacher.is_available_during(
+                datetime(2024, 1, 8, 8, 0), datetime(2024, 1, 8, 10, 0)
+            )
+        )
+
+        teacher.unavailable_dates = "2024-01-08"
+        self.assertFalse(teacher.is_available_on(monday))
+
+        teacher.unavailable_dates = None
+        for availability in list(teacher.availabilities):
+            db.session.delete(availability)
+        db.session.commit()
+        self.assertFalse(teacher.is_available_on(monday))
+
+    def test_class_group_unavailable_dates_follow_edits(self) -> None:
+        class_group = ClassGroup(name="INFO1", unavailable_dates="2024-01-09")
+        db.session.add(class_group)
+        db.session.commit()
+        self.assertTrue(class_group.is_available_on(date(2024, 1, 8)))
+        self.assertFalse(class_group.is_available_on(date(2024, 1, 9)))
+
+        class_group.unavailable_dates = "2024-01-08\n2024-01-10"
+        self.assertFalse(class_group.is_available_on(date(2024, 1, 8)))
+        self.assertTrue(class_group.is_available_on(date(2024, 1, 9)))
+
+    def test_class_group_availability_follows_session_moves(self) -> None:
+        class_group = ClassGroup(name="INFO1")
+        session = Session(
+            course=Course(name="CM - Algorithmique - S1", course_type="CM", semester="S1"),
+            teacher=Teacher(name="Alice"),
+            room=Room(name="A101", capacity=30),
+            class_group=class_group,
+            start_time=datetime(2024, 1, 8, 8, 0),
+            end_time=datetime(2024, 1, 8, 12, 0),
+        )
+        db.session.add(session)
+        db.session.commit()
+        self.assertFalse(
+            class_group.is_available_during(
+                datetime(2024, 1, 8, 10, 0), datetime(2024, 1, 8, 11, 0)
+            )
+        )
+        self.assertTrue(
+            class_group.is_available_during(
+                datetime(2024, 1, 8, 12, 0), datetime(2024, 1, 8, 13, 0)
+            )
+        )
+
+        session.start_time = datetime(2024, 1, 8, 13, 0)
+        session.end_time = datetime(2024, 1, 8, 15, 0)
+        self.assertTrue(
+            class_group.is_available_during(
+                datetime(2024, 1, 8, 10, 0), datetime(2024, 1, 8, 11, 0)
+            )
+        )
+        self.assertFalse(
+            class_group.is_available_during(
+                datetime(2024, 1, 8, 14, 0), datetime(2024, 1, 8, 16, 0)
+            )
+        )
 
     def test_best_teacher_duos_prefers_shared_availability(self) -> None:
         teacher_a = Teacher(name="Alice")
@@ -377,6 +563,96 @@ class TeacherAssignmentTestCase(DatabaseTestCase):
         self.assertIn(link_a.class_group_id, duos)
         self.assertNotIn(link_b.class_group_id, duos)
 
+    def test_recommended_duos_break_ties_alphabetically(self) -> None:
+        course, link, _ = self._create_tp_course()
+        teachers = [Teacher(name=name) for name in ("David", "Chloé", "bruno", "Alice")]
+        for teacher in teachers:
+            teacher.availabilities.append(
+                TeacherAvailability(weekday=0, start_time=time(8, 0), end_time=time(12, 0))
+            )
+        db.session.add_all(teachers)
+        db.session.commit()
+
+        duos = recommend_teacher_duos_for_classes(course.class_links, teachers)
+
+        first, second, overlap = duos[link.class_group_id]
+        self.assertEqual({first.name, second.name}, {"Alice", "bruno"})
+        self.assertEqual(overlap, 4.0)
+
+    def test_recommended_duos_break_pairing_ties_by_sorted_pairs(self) -> None:
+        course, link_a, _ = self._create_tp_course()
+        class_group_b = ClassGroup(name="INFO4", size=24)
+        link_b = CourseClassLink(class_group=class_group_b, group_count=2)
+        course.class_links.append(link_b)
+        db.session.add(class_group_b)
+        teachers = {
+            name: Teacher(name=name) for name in ("David", "Chloé", "bruno", "Alice")
+        }
+        # Alice-bruno + Chloé-David and Alice-Chloé + bruno-David both share
+        # four hours; the other two pairs share nothing.
+        for name, weekday, start in (
+            ("Alice", 0, 8),
+            ("bruno", 0, 8),
+            ("Chloé", 0, 14),
+            ("David", 0, 14),
+            ("Alice", 1, 8),
+            ("Chloé", 1, 8),
+            ("bruno", 1, 14),
+            ("David", 1, 14),
+        ):
+            teachers[name].availabilities.append(
+                TeacherAvailability(
+                    weekday=weekday,
+                    start_time=time(start, 0),
+                    end_time=time(start + 2, 0),
+                )
+            )
+        db.session.add_all(teachers.values())
+        db.session.commit()
+
+        duos = recommend_teacher_duos_for_classes(
+            course.class_links, list(teachers.values())
+        )
+
+        self.assertEqual(
+            {
+                class_group_id: (first.name, second.name, overlap)
+                for class_group_id, (first, second, overlap) in duos.items()
+            },
+            {
+                link_a.class_group_id: ("bruno", "Alice", 2.0),
+                link_b.class_group_id: ("David", "Chloé", 2.0),
+            },
+        )
+
+    def test_recommended_duos_break_ties_with_spare_teachers(self) -> None:
+        course, link_a, _ = self._create_tp_course()
+        class_group_b = ClassGroup(name="INFO4", size=24)
+        link_b = CourseClassLink(class_group=class_group_b, group_count=2)
+        course.class_links.append(link_b)
+        db.session.add(class_group_b)
+        names = ("Fanny", "David", "Chloé", "Emma", "bruno", "Alice")
+        teachers = [Teacher(name=name) for name in names]
+        for teacher in teachers:
+            teacher.availabilities.append(
+                TeacherAvailability(weekday=0, start_time=time(8, 0), end_time=time(12, 0))
+            )
+        db.session.add_all(teachers)
+        db.session.commit()
+
+        duos = recommend_teacher_duos_for_classes(course.class_links, teachers)
+
+        self.assertEqual(
+            {
+                class_group_id: (first.name, second.name, overlap)
+                for class_group_id, (first, second, overlap) in duos.items()
+            },
+            {
+                link_a.class_group_id: ("bruno", "Alice", 4.0),
+                link_b.class_group_id: ("Chloé", "Emma", 4.0),
+            },
+        )
+
     def test_recommended_duos_maximise_shared_availability(self) -> None:
         course, link_a, _ = self._create_tp_course()
         class_group_b = ClassGroup(name="INFO4", size=24)
@@ -527,6 +803,7 @@ class DashboardActionsTestCase(DatabaseTestCase):
 
         log_a = CourseScheduleLog(course=course_a, status="success", summary="OK")
         log_b = CourseScheduleLog(course=course_b, status="warning", summary="Warn")
+        log_b_retry = CourseScheduleLog(course=course_b, status="success", summary="OK")
 
         db.session.add_all(
             [
@@ -542,12 +819,13 @@ class DashboardActionsTestCase(DatabaseTestCase):
                 session_b,
                 log_a,
                 log_b,
+                log_b_retry,
             ]
         )
         db.session.commit()
 
         self.assertEqual(Session.query.count(), 2)
-        self.assertEqual(CourseScheduleLog.query.count(), 2)
+        self.assertEqual(CourseScheduleLog.query.count(), 3)
 
         client = self.app.test_client()
         base_path = self.app.config.get("URL_PREFIX", "") or ""
@@ -558,8 +836,354 @@ class DashboardActionsTestCase(DatabaseTestCase):
         )
 
         self.assertEqual(response.status_code, 302)
+        with client.session_transaction() as flask_session:
+            flashes = flask_session["_flashes"]
+        self.assertEqual(
+            flashes,
+            [
+                (
+                    "success",
+                    "2 séance(s) planifiée(s) et 3 journal(aux) de génération "
+                    "supprimé(s) pour l'ensemble des cours.",
+                )
+            ],
+        )
         self.assertEqual(Session.query.count(), 0)
         self.assertEqual(CourseScheduleLog.query.count(), 0)
+        self.assertEqual(
+            db.session.execute(text("SELECT COUNT(*) FROM session_attendance")).scalar(),
+            0,
+        )
+
+    def test_generation_clear_removes_every_course_schedule(self) -> None:
+        class_group = ClassGroup(name="INFO2", size=24)
+        teacher = Teacher(name="Claire")
+        room = Room(name="B103", capacity=30)
+        courses = [
+            Course(name=f"CM - {name} - S1", course_type="CM", semester="S1")
+            for name in ("Analyse", "Algèbre", "Chimie")
+        ]
+        for day, course in enumerate(courses[:2], start=8):
+            course.class_links.append(CourseClassLink(class_group=class_group))
+            session = Session(
+                course=course,
+                teacher=teacher,
+                room=room,
+                class_group=class_group,
+                start_time=datetime(2024, 1, day, 8, 0, 0),
+                end_time=datetime(2024, 1, day, 10, 0, 0),
+            )
+            session.attendees = [class_group]
+            db.session.add(session)
+        db.session.add(
+            CourseScheduleLog(course=courses[2], status="error", summary="KO")
+        )
+        db.session.add_all(courses)
+        db.session.commit()
+
+        client = self.app.test_client()
+        base_path = self.app.config.get("URL_PREFIX", "") or ""
+        response = client.post(f"{base_path}/generation", data={"form": "clear"})
+
+        self.assertEqual(response.status_code, 302)
+        with client.session_transaction() as flask_session:
+            flashes = flask_session["_flashes"]
+        self.assertEqual(
+            flashes,
+            [("success", "2 séance(s) supprimée(s) et 1 journal(aux) réinitialisé(s).")],
+        )
+        self.assertEqual(Session.query.count(), 0)
+        self.assertEqual(CourseScheduleLog.query.count(), 0)
+
+    def test_deleting_course_cascades_to_unloaded_sessions(self) -> None:
+        course = Course(name="CM - Analyse - S1", course_type="CM", semester="S1")
+        class_group = ClassGroup(name="INFO2", size=24)
+        course.class_links.append(CourseClassLink(class_group=class_group))
+        teacher = Teacher(name="Claire")
+        room = Room(name="B103", capacity=30)
+        session = Session(
+            course=course,
+            teacher=teacher,
+            room=room,
+            class_group=class_group,
+            start_time=datetime(2024, 1, 8, 8, 0, 0),
+            end_time=datetime(2024, 1, 8, 10, 0, 0),
+        )
+        session.attendees = [class_group]
+        db.session.add_all([course, class_group, teacher, room, session])
+        db.session.commit()
+        course_id = course.id
+        db.session.expunge_all()
+
+        db.session.delete(db.session.get(Course, course_id))
+        db.session.commit()
+
+        self.assertEqual(Session.query.count(), 0)
+        self.assertEqual(
+            db.session.execute(text("SELECT COUNT(*) FROM session_attendance")).scalar(),
+            0,
+        )
+
+
+class CourseHoursTestCase(DatabaseTestCase):
+    def test_scheduled_hours_matches_between_sql_and_loaded_sessions(self) -> None:
+        course = Course(name="TD - Analyse - S1", course_type="TD", semester="S1")
+        class_group = ClassGroup(name="INFO2", size=24)
+        teacher = Teacher(name="Claire")
+        room = Room(name="B103", capacity=30)
+        spans = [
+            (datetime(2024, 1, 8, 8, 0), datetime(2024, 1, 8, 10, 0)),
+            (datetime(2024, 1, 9, 13, 30), datetime(2024, 1, 9, 15, 15)),
+            (datetime(2024, 1, 10, 8, 0), datetime(2024, 1, 10, 9, 0)),
+        ]
+        for start, end in spans:
+            db.session.add(
+                Session(
+                    course=course,
+                    teacher=teacher,
+                    room=room,
+                    class_group=class_group,
+                    start_time=start,
+                    end_time=end,
+                )
+            )
+        db.session.add_all([course, class_group, teacher, room])
+        db.session.commit()
+        course_id = course.id
+        db.session.expunge_all()
+
+        course = db.session.get(Course, course_id)
+        self.assertEqual(course.scheduled_hours, 4)
+        self.assertNotIn("sessions", course.__dict__)
+        self.assertEqual(len(course.sessions), 3)
+        self.assertEqual(course.scheduled_hours, 4)
+
+        moved = min(course.sessions, key=lambda session: session.start_time)
+        moved.end_time = moved.start_time + timedelta(hours=3)
+        db.session.commit()
+        db.session.expunge_all()
+        self.assertEqual(db.session.get(Course, course_id).scheduled_hours, 5)
+        self.assertEqual(
+            db.session.scalar(select(Course.scheduled_hours).where(Course.id == course_id)),
+            5,
+        )
+
+    def test_teacher_hours_by_course_match_between_sql_and_loaded_sessions(self) -> None:
+        analysis = Course(name="TD - Analyse - S1", course_type="TD", semester="S1")
+        networks = Course(name="TD - Réseaux - S1", course_type="TD", semester="S1")
+        class_group = ClassGroup(name="INFO2", size=24)
+        teacher = Teacher(name="Claire")
+        other = Teacher(name="Damien")
+        room = Room(name="B103", capacity=30)
+        for course, owner, day, hours in (
+            (analysis, teacher, 8, 2),
+            (analysis, teacher, 9, 3),
+            (networks, teacher, 10, 1),
+            (networks, other, 11, 2),
+        ):
+            start = datetime(2024, 1, day, 8, 0)
+            db.session.add(
+                Session(
+                    course=course,
+                    teacher=owner,
+                    room=room,
+                    class_group=class_group,
+                    start_time=start,
+                    end_time=start + timedelta(hours=hours),
+                )
+            )
+        db.session.commit()
+        expected = {analysis.id: 5, networks.id: 1}
+        teacher_id = teacher.id
+        db.session.expunge_all()
+
+        teacher = db.session.get(Teacher, teacher_id)
+        self.assertEqual(teacher.scheduled_hours_by_course(), expected)
+        self.assertNotIn("sessions", teacher.__dict__)
+        self.assertEqual(len(teacher.sessions), 3)
+        self.assertEqual(teacher.scheduled_hours_by_course(), expected)
+
+    def test_total_required_hours_matches_between_sql_and_loaded_rows(self) -> None:
+        course = Course(
+            name="TP - Réseaux - S1",
+            course_type="TP",
+            semester="S1",
+            session_length_hours=2,
+            sessions_per_week=2,
+        )
+        course.class_links.append(
+            CourseClassLink(class_group=ClassGroup(name="INFO1"), group_count=2)
+        )
+        course.class_links.append(CourseClassLink(class_group=ClassGroup(name="INFO2")))
+        course.allowed_weeks.append(CourseAllowedWeek(week_start=date(2024, 1, 8)))
+        course.allowed_weeks.append(
+            CourseAllowedWeek(week_start=date(2024, 1, 15), sessions_target=3)
+        )
+        db.session.add(course)
+        db.session.commit()
+        course_id = course.id
+        db.session.expunge_all()
+
+        course = db.session.get(Course, course_id)
+        db.session.expire(course, ["class_links"])
+        self.assertEqual(course.total_required_hours, (2 + 3) * 2 * 3)
+        self.assertNotIn("allowed_weeks", course.__dict__)
+        self.assertNotIn("class_links", course.__dict__)
+        self.assertEqual(len(course.allowed_weeks), 2)
+        self.assertEqual(len(course.class_links), 2)
+        self.assertEqual(course.total_required_hours, (2 + 3) * 2 * 3)
+
+    def test_total_required_hours_expression_matches_python_side(self) -> None:
+        info1 = ClassGroup(name="INFO1")
+        info2 = ClassGroup(name="INFO2")
+        weekly = Course(
+            name="TP - Réseaux - S1",
+            course_type="TP",
+            semester="S1",
+            session_length_hours=2,
+            sessions_per_week=2,
+        )
+        weekly.class_links.append(CourseClassLink(class_group=info1, group_count=2))
+        weekly.class_links.append(CourseClassLink(class_group=info2))
+        weekly.allowed_weeks.append(CourseAllowedWeek(week_start=date(2024, 1, 8)))
+        weekly.allowed_weeks.append(
+            CourseAllowedWeek(week_start=date(2024, 1, 15), sessions_target=3)
+        )
+        lecture = Course(
+            name="CM - Analyse - S1", course_type="CM", semester="S1", sessions_required=5
+        )
+        lecture.class_links.append(CourseClassLink(class_group=info1, group_count=2))
+        idle_weeks = Course(
+            name="TD - Analyse - S1", course_type="TD", semester="S1", sessions_required=4
+        )
+        idle_weeks.allowed_weeks.append(
+            CourseAllowedWeek(week_start=date(2024, 1, 8), sessions_target=0)
+        )
+        db.session.add_all([weekly, lecture, idle_weeks])
+        db.session.commit()
+
+        expected = {
+            course.id: course.total_required_hours
+            for course in (weekly, lecture, idle_weeks)
+        }
+        self.assertEqual(expected[weekly.id], 30)
+        db.session.expunge_all()
+        computed = dict(
+            db.session.execute(select(Course.id, Course.total_required_hours)).all()
+        )
+        self.assertEqual(computed, expected)
+        self.assertEqual(
+            Course.hours_map(expected),
+            {course_id: (hours, 0) for course_id, hours in expected.items()},
+        )
+        self.assertEqual(Course.hours_map([]), {})
+
+    def test_teacher_allocation_map_follows_allocation_changes(self) -> None:
+        course = Course(name="TD - Analyse - S1", course_type="TD", semester="S1")
+        teacher_a = Teacher(name="Alice")
+        teacher_b = Teacher(name="Bruno")
+        db.session.add_all([course, teacher_a, teacher_b])
+        db.session.commit()
+        course.teacher_allocations.append(
+            CourseTeacherAllocation(teacher_id=teacher_a.id, target_hours=6)
+        )
+        self.assertEqual(course.teacher_allocation_map, {teacher_a.id: 6})
+
+        course.teacher_allocations[0].target_hours = 4
+        self.assertEqual(course.teacher_allocation_map, {teacher_a.id: 4})
+        course.teacher_allocations.append(
+            CourseTeacherAllocation(teacher_id=teacher_b.id, target_hours=2)
+        )
+        self.assertEqual(course.teacher_allocation_map, {teacher_a.id: 4, teacher_b.id: 2})
+        db.session.commit()
+        self.assertEqual(course.teacher_allocation_map, {teacher_a.id: 4, teacher_b.id: 2})
+
+    def test_class_link_lookup_follows_reassigned_class(self) -> None:
+        course = Course(name="TD - Analyse - S1", course_type="TD", semester="S1")
+        first = ClassGroup(name="A1")
+        second = ClassGroup(name="A2")
+        db.session.add_all([course, first, second])
+        db.session.commit()
+        link = CourseClassLink(class_group_id=first.id, group_count=2)
+        course.class_links.append(link)
+        self.assertIs(course.class_link_for(first), link)
+
+        link.class_group_id = second.id
+        self.assertIsNone(course.class_link_for(first))
+        self.assertIs(course.class_link_for(second), link)
+
+    def test_capacity_needed_for_accepts_class_ids(self) -> None:
+        course = Course(name="TP - Réseaux - S1", course_type="TP", semester="S1")
+        linked = ClassGroup(name="A1", size=25)
+        unlinked = ClassGroup(name="A2", size=30)
+        course.class_links.append(CourseClassLink(class_group=linked, group_count=2))
+        db.session.add_all([course, unlinked])
+        db.session.commit()
+
+        self.assertEqual(course.capacity_needed_for(linked.id), 13)
+        self.assertEqual(course.capacity_needed_for(linked), 13)
+        self.assertEqual(course.capacity_needed_for(unlinked.id), 1)
+
+
+class ClosingPeriodTestCase(DatabaseTestCase):
+    def test_cached_closed_days_follow_table_writes(self) -> None:
+        day = date(2024, 1, 3)
+        self.assertFalse(ClosingPeriod.is_day_closed_cached(day))
+
+        db.session.add_all(
+            [
+                ClosingPeriod(start_date=date(2023, 12, 20), end_date=date(2024, 1, 4)),
+                ClosingPeriod(start_date=date(2023, 12, 24), end_date=date(2023, 12, 26)),
+            ]
+        )
+        db.session.commit()
+        self.assertTrue(ClosingPeriod.is_day_closed_cached(day))
+        self.assertFalse(ClosingPeriod.is_day_closed_cached(date(2024, 1, 5)))
+        self.assertTrue(ClosingPeriod.overlaps(date(2024, 1, 8), date(2024, 1, 4)))
+        self.assertTrue(ClosingPeriod.overlaps(date(2023, 12, 1), date(2023, 12, 20)))
+        self.assertFalse(ClosingPeriod.overlaps(date(2024, 1, 5), date(2024, 1, 8)))
+        self.assertFalse(ClosingPeriod.overlaps(date(2023, 12, 1), date(2023, 12, 19)))
+        self.assertEqual(
+            ClosingPeriod.closed_ranges(),
+            [
+                (date(2023, 12, 20), date(2024, 1, 4)),
+                (date(2023, 12, 24), date(2023, 12, 26)),
+            ],
+        )
+
+        ClosingPeriod.query.delete()
+        db.session.commit()
+        self.assertFalse(ClosingPeriod.is_day_closed_cached(day))
+
+
+class CourseScheduleLogTestCase(DatabaseTestCase):
+    def test_messages_round_trip_and_tolerate_legacy_text(self) -> None:
+        course = Course(name="CM - Algorithmique - S1", course_type="CM", semester="S1")
+        log = CourseScheduleLog(
+            course=course,
+            status="warning",
+            messages=[
+                {"level": "WARNING", "message": " Salle indisponible ", "suggestions": ["A", "A"]},
+                {"level": "info", "message": ""},
+            ],
+        )
+        legacy = CourseScheduleLog(course=course, status="error")
+        db.session.add_all([course, log, legacy])
+        db.session.commit()
+        db.session.execute(
+            text("UPDATE course_schedule_log SET messages = 'not json' WHERE id = :id"),
+            {"id": legacy.id},
+        )
+        db.session.commit()
+        log_id, legacy_id = log.id, legacy.id
+        db.session.expunge_all()
+
+        reloaded = db.session.get(CourseScheduleLog, log_id)
+        self.assertEqual(
+            reloaded.parsed_messages(),
+            [{"level": "warning", "message": "Salle indisponible", "suggestions": ["A"]}],
+        )
+        self.assertEqual(db.session.get(CourseScheduleLog, legacy_id).parsed_messages(), [])
 
 
 class SubgroupParallelismTestCase(DatabaseTestCase):
@@ -981,6 +1605,111 @@ class ChronologyValidationTestCase(DatabaseTestCase):
 
         db.session.commit()
 
+    def test_validation_reports_teacher_and_room_overlaps(self) -> None:
+        booked = Session(
+            course=self.course_cm,
+            teacher=self.teacher,
+            room=self.room,
+            class_group=self.class_group,
+            start_time=datetime(2024, 1, 9, 10, 0, 0),
+            end_time=datetime(2024, 1, 9, 12, 0, 0),
+        )
+        booked.attendees = [self.class_group]
+        db.session.add(booked)
+        db.session.commit()
+        db.session.expire_all()
+
+        error = _validate_session_constraints(
+            self.course_cm,
+            self.teacher,
+            self.room,
+            [self.class_group],
+            datetime(2024, 1, 9, 10, 15, 0),
+            datetime(2024, 1, 9, 12, 15, 0),
+        )
+        self.assertEqual(error, "L'enseignant a déjà une séance sur ce créneau.")
+        self.assertNotIn("sessions", self.teacher.__dict__)
+        for owner, column in ((self.teacher, Session.teacher_id), (self.room, Session.room_id)):
+            self.assertTrue(
+                _has_booking_conflict(
+                    owner, column, datetime(2024, 1, 9, 11), datetime(2024, 1, 9, 13)
+                )
+            )
+            self.assertFalse(
+                _has_booking_conflict(
+                    owner, column, datetime(2024, 1, 9, 12), datetime(2024, 1, 9, 14)
+                )
+            )
+            self.assertFalse(
+                _has_booking_conflict(
+                    owner,
+                    column,
+                    datetime(2024, 1, 9, 11),
+                    datetime(2024, 1, 9, 13),
+                    ignore_session_id=booked.id,
+                )
+            )
+
+    def test_teacher_and_room_timelines_follow_bookings(self) -> None:
+        booked = Session(
+            course=self.course_cm,
+            teacher=self.teacher,
+            room=self.room,
+            class_group=self.class_group,
+            start_time=datetime(2024, 1, 9, 8, 0, 0),
+            end_time=datetime(2024, 1, 9, 12, 0, 0),
+        )
+        db.session.add(booked)
+        db.session.add(
+            Session(
+                course=self.course_td,
+                teacher=self.teacher,
+                room=self.room,
+                class_group=self.class_group,
+                start_time=datetime(2024, 1, 9, 9, 0, 0),
+                end_time=datetime(2024, 1, 9, 10, 0, 0),
+            )
+        )
+        db.session.commit()
+
+        for owner in (self.teacher, self.room):
+            # The long morning session still covers 11:00 even though a
+            # shorter one starts after it.
+            self.assertTrue(
+                owner.has_session_during(datetime(2024, 1, 9, 11), datetime(2024, 1, 9, 13))
+            )
+            self.assertFalse(
+                owner.has_session_during(datetime(2024, 1, 9, 12), datetime(2024, 1, 9, 14))
+            )
+            self.assertFalse(
+                owner.has_session_during(
+                    datetime(2024, 1, 9, 11),
+                    datetime(2024, 1, 9, 13),
+                    ignore_session_id=booked.id,
+                )
+            )
+
+        booked.end_time = datetime(2024, 1, 9, 10, 30, 0)
+        for owner in (self.teacher, self.room):
+            self.assertFalse(
+                owner.has_session_during(datetime(2024, 1, 9, 11), datetime(2024, 1, 9, 13))
+            )
+
+        db.session.add(
+            Session(
+                course=self.course_tp,
+                teacher=self.teacher,
+                room=self.room,
+                class_group=self.class_group,
+                start_time=datetime(2024, 1, 9, 12, 30, 0),
+                end_time=datetime(2024, 1, 9, 13, 30, 0),
+            )
+        )
+        for owner in (self.teacher, self.room):
+            self.assertTrue(
+                owner.has_session_during(datetime(2024, 1, 9, 11), datetime(2024, 1, 9, 13))
+            )
+
     def test_validation_blocks_td_before_cm(self) -> None:
         cm_session = Session(
             course=self.course_cm,
@@ -1586,5 +2315,53 @@ class ScheduleGenerationFailureTestCase(DatabaseTestCase):
         )
 
 
+class ProgressRegistryTestCase(unittest.TestCase):
+    def test_purge_drops_only_trackers_finished_long_enough_ago(self) -> None:
+        registry = ProgressRegistry()
+        clock = [100.0]
+        with patch("app.progress.time.monotonic", side_effect=lambda: clock[0]):
+            running = registry.create("En cours")
+            early = registry.create("Ancien")
+            late = registry.create("Récent")
+            early.complete()
+            clock[0] = 150.0
+            late.fail("Erreur")
+
+            clock[0] = 720.0
+            registry.purge()
+            self.assertIsNone(registry.get(early.job_id))
+            self.assertIs(registry.get(late.job_id), late)
+            self.assertIs(registry.get(running.job_id), running)
+
+            # Finishing again restarts the retention period.
+            late.complete()
+            clock[0] = 800.0
+            registry.purge()
+            self.assertIs(registry.get(late.job_id), late)
+            clock[0] = 1400.0
+            registry.purge()
+            self.assertIsNone(registry.get(late.job_id))
+            self.assertIs(registry.get(running.job_id), running)
+
+    def test_tracker_snapshot_reflects_each_update(self) -> None:
+        clock = [10.0]
+        with patch("app.progress.time.monotonic", side_effect=lambda: clock[0]):
+            tracker = ScheduleProgressTracker("Génération")
+            self.assertEqual(tracker.snapshot().percent, 0)
+            tracker.initialise(8)
+            clock[0] = 20.0
+            tracker.record(2, sessions=1)
+            snapshot = tracker.snapshot()
+            self.assertEqual((snapshot.state, snapshot.percent), ("running", 25))
+            self.assertEqual(snapshot.eta_seconds, 30.0)
+            clock[0] = 30.0
+            self.assertEqual(tracker.snapshot().eta_seconds, 60.0)
+            tracker.complete("Terminé")
+            snapshot = tracker.snapshot()
+            self.assertEqual((snapshot.percent, snapshot.message), (100, "Terminé"))
+            self.assertTrue(snapshot.finished)
+            self.assertTrue(tracker.is_finished())
+
+
 if __name__ == "__main__":
     unittest.main()